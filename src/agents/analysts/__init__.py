@@ -12,4 +12,4 @@ __all__ = [
     "fundamental_agent", 
     "macroeconomic_agent",
     "policy_agent"
-    ] 
\ No newline at end of file
+    ]
\ No newline at end of file
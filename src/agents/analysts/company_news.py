@@ -1,7 +1,7 @@
 from graph.constants import AgentKey
 from llm.prompt import COMPANY_NEWS_PROMPT
 from graph.schema import FundState, AnalystSignal
-from llm.inference import agent_call
+from llm.inference import aagent_call
 from apis.router import Router, APISource
 from util.db_helper import get_db
 from util.logger import logger
@@ -11,7 +11,7 @@ thresholds = {
     "news_count": 10,
 }
 
-def company_news_agent(state: FundState):
+async def company_news_agent(state: FundState):
     """News specialist analyzing company news to provide a signal."""
     agent_name = AgentKey.COMPANY_NEWS
     ticker = state["ticker"]
@@ -21,23 +21,23 @@ def company_news_agent(state: FundState):
 
     # Get db instance
     db = get_db()
-    
+
     logger.log_agent_status(agent_name, ticker, "Fetching company news")
-    
+
     # Get the company news
-    router = Router(APISource.ALPHA_VANTAGE)
+    router = Router([APISource.ALPHA_VANTAGE, APISource.YFINANCE])
     try:
-        company_news = router.get_us_stock_news(ticker, trading_date, thresholds["news_count"])
+        company_news = await router.aget_us_stock_news(ticker, trading_date, thresholds["news_count"])
     except Exception as e:
         logger.error(f"Failed to fetch company news for {ticker}: {e}")
-        return state
+        return {"analyst_signals": []}
 
     # Analyze news sentiment via LLM
     news_dict = [m.model_dump_json() for m in company_news]
     prompt = COMPANY_NEWS_PROMPT.format(news=news_dict)
 
     # Get LLM signal
-    signal = agent_call(
+    signal = await aagent_call(
         prompt=prompt,
         llm_config=llm_config,
         pydantic_model=AnalystSignal,
@@ -46,5 +46,5 @@ def company_news_agent(state: FundState):
     # save signal
     logger.log_signal(agent_name, ticker, signal)
     db.save_signal(portfolio_id, agent_name, ticker, prompt, signal)
-    
+
     return {"analyst_signals": [signal]}
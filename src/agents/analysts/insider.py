@@ -1,7 +1,7 @@
 from graph.constants import AgentKey
 from llm.prompt import INSIDER_PROMPT
 from graph.schema import FundState, AnalystSignal
-from llm.inference import agent_call
+from llm.inference import aagent_call
 from apis.router import Router, APISource
 from util.db_helper import get_db
 from util.logger import logger
@@ -11,7 +11,7 @@ thresholds = {
     "num_trades": 10,
 }
 
-def insider_agent(state: FundState):
+async def insider_agent(state: FundState):
     """Insider trading specialist analyzing insider activity patterns."""
     agent_name = AgentKey.INSIDER
     llm_config = state["llm_config"]
@@ -23,24 +23,24 @@ def insider_agent(state: FundState):
     db = get_db()
 
     logger.log_agent_status(agent_name, ticker, "Fetching insider trades")
-    
+
     # Get the insider trades
     router = Router(APISource.ALPHA_VANTAGE)
     try:
-        insider_trades = router.get_us_stock_insider_trades(
+        insider_trades = await router.aget_us_stock_insider_trades(
             ticker=ticker,
             trading_date=trading_date,
             limit=thresholds["num_trades"],
         )
     except Exception as e:
         logger.error(f"Failed to fetch insider trades for {ticker}: {e}")
-        return state
+        return {"analyst_signals": []}
 
     # Analyze insider trading signal via LLM
     trades_dict = [m.model_dump_json() for m in insider_trades]
     prompt = INSIDER_PROMPT.format(num_trades=thresholds["num_trades"],trades=trades_dict)
 
-    signal = agent_call(
+    signal = await aagent_call(
         prompt=prompt,
         llm_config=llm_config,
         pydantic_model=AnalystSignal
@@ -49,7 +49,5 @@ def insider_agent(state: FundState):
     # save signal
     logger.log_signal(agent_name, ticker, signal)
     db.save_signal(portfolio_id, agent_name, ticker, prompt, signal)
-    
-    return {"analyst_signals": [signal]}
-
 
+    return {"analyst_signals": [signal]}
@@ -1,39 +1,44 @@
 from graph.schema import FundState, AnalystSignal
 from graph.constants import AgentKey
 from llm.prompt import MACROECONOMIC_PROMPT
-from llm.inference import agent_call
+from llm.inference import aagent_call
 from apis.router import Router, APISource
 from util.db_helper import get_db
 from util.logger import logger
 
-def macroeconomic_agent(state: FundState):
-    """Macroeconomic analysis specialist focusing on economic indicators."""
+async def macroeconomic_agent(state: FundState):
+    """
+    Macroeconomic analysis specialist focusing on economic indicators.
+    Market-scoped: runs once per trading date, the signal is shared by state["tickers"].
+    """
     agent_name = AgentKey.MACROECONOMIC
-    ticker = state["ticker"]
+    tickers = state["tickers"]
+    trading_date = state["trading_date"]
     llm_config = state["llm_config"]
     portfolio_id = state["portfolio"].id
 
     # Get db instance
     db = get_db()
 
-    logger.log_agent_status(agent_name, ticker, "Fetching macro economic indicators")
+    logger.log_agent_status(agent_name, None, "Fetching macro economic indicators")
 
     # Get the economic indicators
     router = Router(APISource.ALPHA_VANTAGE)
     try:
-        economic_indicators = router.get_us_economic_indicators()
+        economic_indicators = await router.aget_us_economic_indicators(trading_date)
     except Exception as e:
-        logger.error(f"Failed to fetch economic indicators for {ticker}: {e}")
-        return state
-    
+        logger.error(f"Failed to fetch economic indicators: {e}")
+        return {"analyst_signals": []}
+
     prompt = MACROECONOMIC_PROMPT.format(economic_indicators=economic_indicators)
-    signal = agent_call(
-        prompt=prompt, 
-        llm_config=llm_config, 
+    signal = await aagent_call(
+        prompt=prompt,
+        llm_config=llm_config,
         pydantic_model=AnalystSignal)
-    
-    # save signal
-    logger.log_signal(agent_name, ticker, signal)
-    db.save_signal(portfolio_id, agent_name, ticker, prompt, signal)
-    
-    return {"analyst_signals": [signal]}
\ No newline at end of file
+
+    # save signal for every ticker it fans out to
+    logger.log_signal(agent_name, ", ".join(tickers), signal)
+    for ticker in tickers:
+        db.save_signal(portfolio_id, agent_name, ticker, prompt, signal)
+
+    return {"analyst_signals": [signal]}
@@ -1,45 +1,55 @@
+import asyncio
 from graph.constants import AgentKey
 from llm.prompt import POLICY_PROMPT
 from graph.schema import FundState, AnalystSignal
-from llm.inference import agent_call
+from llm.inference import aagent_call
 from apis.router import Router, APISource
 from util.db_helper import get_db
 from util.logger import logger
 
+# Alpha Vantage news topics
+FISCAL_TOPIC = "economy_fiscal"
+MONETARY_TOPIC = "economy_monetary"
+
 # thresholds
 thresholds = {
     "news_count": 10,
 }
 
-def policy_agent(state: FundState):
-    """policy specialist analyzing market news to provide a signal."""
+async def policy_agent(state: FundState):
+    """
+    policy specialist analyzing market news to provide a signal.
+    Market-scoped: runs once per trading date, the signal is shared by state["tickers"].
+    """
     agent_name = AgentKey.POLICY
-    ticker = state["ticker"]
+    tickers = state["tickers"]
     trading_date = state["trading_date"]
     llm_config = state["llm_config"]
     portfolio_id = state["portfolio"].id
 
     # Get db instance
     db = get_db()
-    
-    logger.log_agent_status(agent_name, ticker, "Fetching policy related news")
-    
+
+    logger.log_agent_status(agent_name, None, "Fetching policy related news")
+
     # Get the policy news
-    router = Router(APISource.ALPHA_VANTAGE)
+    router = Router([APISource.ALPHA_VANTAGE, APISource.YFINANCE])
     try:
-        fiscal_policy = router.get_market_news(
-            topic="economy_fiscal", 
-            trading_date=trading_date, 
-            news_count=thresholds["news_count"]
-            )
-        monetary_policy = router.get_market_news(
-            topic="economy_monetary", 
-                trading_date=trading_date, 
+        fiscal_policy, monetary_policy = await asyncio.gather(
+            router.aget_market_news(
+                topic=FISCAL_TOPIC,
+                trading_date=trading_date,
                 news_count=thresholds["news_count"]
-            )
+            ),
+            router.aget_market_news(
+                topic=MONETARY_TOPIC,
+                trading_date=trading_date,
+                news_count=thresholds["news_count"]
+            ),
+        )
     except Exception as e:
-        logger.error(f"Failed to fetch policy news for {ticker}: {e}")
-        return state
+        logger.error(f"Failed to fetch policy news: {e}")
+        return {"analyst_signals": []}
 
     # Analyze news sentiment via LLM
     fiscal_policy_dict = [m.model_dump_json() for m in fiscal_policy]
@@ -47,14 +57,15 @@ def policy_agent(state: FundState):
     prompt = POLICY_PROMPT.format(fiscal_policy=fiscal_policy_dict, monetary_policy=monetary_policy_dict)
 
     # Get LLM signal
-    signal = agent_call(
+    signal = await aagent_call(
         prompt=prompt,
         llm_config=llm_config,
         pydantic_model=AnalystSignal,
     )
 
-    # save signal
-    logger.log_signal(agent_name, ticker, signal)
-    db.save_signal(portfolio_id, agent_name, ticker, prompt, signal)
-    
+    # save signal for every ticker it fans out to
+    logger.log_signal(agent_name, ", ".join(tickers), signal)
+    for ticker in tickers:
+        db.save_signal(portfolio_id, agent_name, ticker, prompt, signal)
+
     return {"analyst_signals": [signal]}
@@ -1,11 +1,15 @@
-import math
+import json
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from graph.schema import FundState, AnalystSignal
 from graph.constants import Signal, AgentKey
 from llm.prompt import TECHNICAL_PROMPT
-from llm.inference import agent_call
+from llm.inference import aagent_call
 from apis.router import Router, APISource
 from util.db_helper import get_db
+from util.indicators import IndicatorEngine, PanelIndicators, get_indicators
+from util.run_cache import get_run_cache
 from util.logger import logger
 
 # Technical Thresholds
@@ -42,76 +46,236 @@ thresholds = {
 
 }
 
+# features are stored under the thresholds they were computed with
+THRESHOLDS_HASH = IndicatorEngine.make_params_key(thresholds)
+# signal_results entries holding a Signal, the others hold formatted text
+SIGNAL_FEATURES = ("trend", "mean_reversion", "rsi", "volatility")
+FEATURES = SIGNAL_FEATURES + ("volume", "price_levels")
+
+# Rule-based scoring, an LLM-free alternative selected per experiment by `technical_scoring`
+scoring_defaults = {
+    "mode": "llm",  # "llm" or "rule"
+    "weights": {
+        "trend": 0.25,
+        "mean_reversion": 0.15,
+        "rsi": 0.15,
+        "volatility": 0.1,
+        "volume": 0.15,
+        "price_levels": 0.2,
+    },
+    # weighted score in [-1, 1] beyond which the signal is bullish / bearish
+    "threshold": 0.2,
+}
+SIGNAL_SCORES = {Signal.BULLISH: 1, Signal.NEUTRAL: 0, Signal.BEARISH: -1}
 
-def technical_agent(state: FundState):
+
+async def technical_agent(state: FundState):
     """Technical analysis specialist that excels at short to medium-term price movement predictions."""
     agent_name = AgentKey.TECHNICAL
     ticker = state["ticker"]
     trading_date = state["trading_date"]
     llm_config = state["llm_config"]
+    scoring = state.get("technical_scoring") or scoring_defaults
     portfolio_id = state["portfolio"].id
-    
+
     # Get db instance
     db = get_db()
-    
+
     logger.log_agent_status(agent_name, ticker, "Analyzing price data")
 
-    # Get the price data
-    router = Router(APISource.ALPHA_VANTAGE)
-    try:
-        prices_df = router.get_us_stock_daily_candles_df(ticker=ticker, trading_date=trading_date)
-    except Exception as e:
-        logger.error(f"Failed to fetch price data for {ticker}: {e}")
-        return state
-
-    # Analyze technical indicators
-    signal_results = {
-        "trend": get_trend_signal(prices_df, thresholds["trend"]),
-        "mean_reversion": get_mean_reversion_signal(prices_df, thresholds["mean_reversion"]),
-        "rsi": get_rsi_signal(prices_df, thresholds["rsi"]),
-        "volatility":  get_volatility_signal(prices_df, thresholds["volatility"]),
-        "volume": get_volume_analysis(prices_df, thresholds["volume"]),
+    signal_results = get_stored_signal_results(ticker, trading_date)
+    if signal_results is None:
+        # Get the price data
+        router = Router(APISource.ALPHA_VANTAGE)
+        try:
+            prices_df = await router.aget_us_stock_daily_candles_df(ticker=ticker, trading_date=trading_date)
+        except Exception as e:
+            logger.error(f"Failed to fetch price data for {ticker}: {e}")
+            return {"analyst_signals": []}
+        signal_results = compute_signal_results(ticker, trading_date, prices_df)
+
+    if scoring["mode"] == "rule":
+        # deterministic aggregate of the sub-signals, no LLM call; the rule config is stored in place of a prompt
+        signal = score_signal_results(signal_results, scoring["weights"], scoring["threshold"])
+        prompt = json.dumps(scoring, sort_keys=True)
+    else:
+        # Make prompt
+        prompt = TECHNICAL_PROMPT.format(
+            ticker=ticker,
+            analysis=signal_results
+        )
+
+        # Get LLM signal
+        signal = await aagent_call(
+            prompt=prompt,
+            llm_config=llm_config,
+            pydantic_model=AnalystSignal
+        )
+
+    # save signal
+    logger.log_signal(agent_name, ticker, signal)
+    db.save_signal(portfolio_id, agent_name, ticker, prompt, signal)
+
+    return {"analyst_signals": [signal]}
+
+
+def get_stored_signal_results(ticker: str, trading_date) -> dict | None:
+    """Signal results computed in panel mode for this run, or by a previous run with the same thresholds."""
+    cache = get_run_cache()
+    signal_results = cache.get(("technical", "signal_results", ticker, trading_date)) if cache else None
+    if signal_results is None:
+        signal_results = load_signal_results(ticker, trading_date)
+    return signal_results
+
+
+def compute_signal_results(ticker: str, trading_date, prices_df: pd.DataFrame) -> dict:
+    """Compute and store a ticker's signal results, advancing its indicators incrementally from the previous run's state."""
+    indicators = get_indicators(ticker, prices_df, thresholds)
+    signal_results = get_signal_results(indicators, prices_df)
+    get_db().save_technical_features(ticker, trading_date, THRESHOLDS_HASH, signal_results)
+    return signal_results
+
+
+def get_signal_results(indicators: IndicatorEngine, prices_df: pd.DataFrame) -> dict:
+    """Evaluate every technical signal from a ticker's indicators and candles."""
+    return {
+        "trend": get_trend_signal(indicators, thresholds["trend"]),
+        "mean_reversion": get_mean_reversion_signal(indicators, thresholds["mean_reversion"]),
+        "rsi": get_rsi_signal(indicators, thresholds["rsi"]),
+        "volatility":  get_volatility_signal(indicators, thresholds["volatility"]),
+        "volume": get_volume_analysis(indicators, thresholds["volume"]),
         "price_levels": get_support_resistance(prices_df, thresholds["support_resistance"]),
     }
 
-    # Make prompt
-    prompt = TECHNICAL_PROMPT.format(
-        ticker=ticker,
-        analysis=signal_results
-    )
 
-    # Get LLM signal
-    signal = agent_call(
-        prompt=prompt,
-        llm_config=llm_config,
-        pydantic_model=AnalystSignal
+def get_scoring_config(config: dict | None) -> dict:
+    """Resolve an experiment's `technical_scoring` config over the defaults, validating it."""
+    config = config or {}
+    mode = config.get("mode", scoring_defaults["mode"])
+    if mode not in ("llm", "rule"):
+        raise ValueError(f"technical_scoring mode must be 'llm' or 'rule', got {mode!r}")
+    unknown = set(config.get("weights", {})) - set(FEATURES)
+    if unknown:
+        raise ValueError(f"Unknown technical_scoring weights: {sorted(unknown)}, choose from {list(FEATURES)}")
+    weights = {**scoring_defaults["weights"], **config.get("weights", {})}
+    if any(w < 0 for w in weights.values()) or not sum(weights.values()):
+        raise ValueError("technical_scoring weights must be non-negative and not all zero")
+    return {
+        "mode": mode,
+        "weights": weights,
+        "threshold": float(config.get("threshold", scoring_defaults["threshold"])),
+    }
+
+
+def _parse_lines(text: str) -> dict:
+    """Read the "- Key: value" lines of a formatted sub-signal."""
+    fields = {}
+    for line in text.splitlines():
+        key, sep, value = line.lstrip("- ").partition(": ")
+        if sep:
+            fields[key] = value
+    return fields
+
+
+def get_sub_signals(signal_results: dict) -> dict:
+    """
+    Direction of each of the six sub-signals. Volume follows its volume trend; price levels are
+    bullish when the price sits closer to support than to resistance, and bearish otherwise.
+    """
+    sub_signals = {feature: Signal(signal_results[feature]) for feature in SIGNAL_FEATURES}
+
+    volume = _parse_lines(signal_results["volume"])
+    sub_signals["volume"] = Signal(volume.get("Volume trend", Signal.NEUTRAL))
+
+    levels = _parse_lines(signal_results["price_levels"])
+    try:
+        to_support, to_resistance = float(levels["Price to support"]), float(levels["Price to resistance"])
+    except (KeyError, ValueError):
+        sub_signals["price_levels"] = Signal.NEUTRAL
+    else:
+        sub_signals["price_levels"] = Signal.BULLISH if to_support < to_resistance else Signal.BEARISH
+    return sub_signals
+
+
+def score_signal_results(signal_results: dict, weights: dict, threshold: float) -> AnalystSignal:
+    """Map the technical sub-signals to an AnalystSignal by their weighted score in [-1, 1]."""
+    sub_signals = get_sub_signals(signal_results)
+    score = sum(weights[f] * SIGNAL_SCORES[s] for f, s in sub_signals.items()) / sum(weights.values())
+
+    if score > threshold:
+        signal = Signal.BULLISH
+    elif score < -threshold:
+        signal = Signal.BEARISH
+    else:
+        signal = Signal.NEUTRAL
+
+    breakdown = ", ".join(f"{f} {s} (weight {weights[f]})" for f, s in sub_signals.items())
+    return AnalystSignal(
+        signal=signal,
+        justification=f"Rule-based technical score {score:.2f} against threshold {threshold}: {breakdown}."
     )
 
-    # save signal
-    logger.log_signal(agent_name, ticker, signal)
-    db.save_signal(portfolio_id, agent_name, ticker, prompt, signal)
 
-    return {"analyst_signals": [signal]}
+def load_signal_results(ticker: str, trading_date) -> dict | None:
+    """Load a ticker's stored technical features for the current thresholds, None if not stored."""
+    features = get_db().get_technical_features(ticker, trading_date, THRESHOLDS_HASH)
+    if not features:
+        return None
+    return {
+        feature: Signal(features[feature]) if feature in SIGNAL_FEATURES else features[feature]
+        for feature in FEATURES
+    }
 
 
-def get_trend_signal(prices_df, params):
+def prefetch_technical_signals(tickers: list[str], trading_date):
+    """
+    Panel mode: compute the technical signals of all tickers in one vectorized pass
+    into the run cache, for technical_agent to pick up.
+    """
+    cache = get_run_cache()
+    if cache is None:
+        return
+    db = get_db()
+    router = Router(APISource.ALPHA_VANTAGE)
+    prices = {}
+    for ticker in tickers:
+        signal_results = load_signal_results(ticker, trading_date)
+        if signal_results is not None:
+            cache.set(("technical", "signal_results", ticker, trading_date), signal_results)
+            continue
+        try:
+            prices_df = router.get_us_stock_daily_candles_df(ticker=ticker, trading_date=trading_date)
+        except Exception as e:
+            logger.warning(f"Panel mode skips {ticker}, failed to fetch price data: {e}")
+            continue
+        if not prices_df.empty:
+            prices[ticker] = prices_df
+    if not prices:
+        return
+
+    panel = PanelIndicators(prices, thresholds)
+    for ticker, prices_df in prices.items():
+        signal_results = get_signal_results(panel.for_ticker(ticker), prices_df)
+        cache.set(("technical", "signal_results", ticker, trading_date), signal_results)
+        db.save_technical_features(ticker, trading_date, THRESHOLDS_HASH, signal_results)
+    logger.info(f"Computed technical signals for {len(prices)} tickers in panel mode")
+
+
+def get_trend_signal(indicators: IndicatorEngine, params):
     """Advanced trend following strategy using multiple timeframes and indicators"""
 
-    def _calculate_ema(prices_df, window):
-        return prices_df["close"].ewm(span=window, adjust=False).mean()
-
-    # Calculate EMAs for multiple timeframes
-    ema_short = _calculate_ema(prices_df, params["short"])
-    ema_medium = _calculate_ema(prices_df, params["medium"])
-    ema_long = _calculate_ema(prices_df, params["long"])
+    # EMAs for multiple timeframes
+    ema_short = indicators.ema(params["short"])
+    ema_medium = indicators.ema(params["medium"])
+    ema_long = indicators.ema(params["long"])
 
     # Determine trend direction and strength
     short_trend = ema_short > ema_medium
     medium_trend = ema_medium > ema_long
 
-    if short_trend.iloc[-1] and medium_trend.iloc[-1]:
+    if short_trend and medium_trend:
         signal = Signal.BULLISH
-    elif not short_trend.iloc[-1] and not medium_trend.iloc[-1]:
+    elif not short_trend and not medium_trend:
         signal = Signal.BEARISH
     else:
         signal = Signal.NEUTRAL
@@ -119,31 +283,27 @@ def get_trend_signal(prices_df, params):
     return signal
 
 
-def get_mean_reversion_signal(prices_df, params):
+def get_mean_reversion_signal(indicators: IndicatorEngine, params):
     """Mean reversion strategy using statistical measures and Bollinger Bands"""
-    
-    def _calculate_bollinger_bands(prices_df: pd.DataFrame, window: int) -> tuple[pd.Series, pd.Series]:
-        sma = prices_df["close"].rolling(window).mean()
-        std_dev = prices_df["close"].rolling(window).std()
-        upper_band = sma + (std_dev * 2)
-        lower_band = sma - (std_dev * 2)
-        return upper_band, lower_band
+    close = indicators.close()
 
-    # Calculate Bollinger Bands with configured window
-    bb_upper, bb_lower = _calculate_bollinger_bands(prices_df, params["bollinger_window"])
+    # Bollinger Bands with configured window
+    sma, std_dev = indicators.rolling_mean_std(params["bollinger_window"])
+    bb_upper = sma + (std_dev * 2)
+    bb_lower = sma - (std_dev * 2)
 
-    # Calculate z-score with configured rolling window
-    ma = prices_df["close"].rolling(window=params["rolling_window"]).mean()
-    std = prices_df["close"].rolling(window=params["rolling_window"]).std()
-    z_score = (prices_df["close"] - ma) / std
+    # z-score with configured rolling window
+    ma, std = indicators.rolling_mean_std(params["rolling_window"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_score = np.float64(close - ma) / std
 
-    # Calculate normalized position within Bollinger Bands
-    price_vs_bb = (prices_df["close"].iloc[-1] - bb_lower.iloc[-1]) / (bb_upper.iloc[-1] - bb_lower.iloc[-1])
+        # normalized position within Bollinger Bands
+        price_vs_bb = np.float64(close - bb_lower) / (bb_upper - bb_lower)
 
     # Use threshold values for signal conditions
-    if z_score.iloc[-1] < params["z_score_extreme"] and price_vs_bb < params["bb_position_threshold"]:
+    if z_score < params["z_score_extreme"] and price_vs_bb < params["bb_position_threshold"]:
         signal = Signal.BULLISH
-    elif z_score.iloc[-1] > params["z_score_extreme"] and price_vs_bb > (1 - params["bb_position_threshold"]):
+    elif z_score > params["z_score_extreme"] and price_vs_bb > (1 - params["bb_position_threshold"]):
         signal = Signal.BEARISH
     else:
         signal = Signal.NEUTRAL
@@ -151,23 +311,12 @@ def get_mean_reversion_signal(prices_df, params):
     return signal
 
 
-def get_rsi_signal(prices_df, params):
+def get_rsi_signal(indicators: IndicatorEngine, params):
     """RSI signal that indicate overbought/oversold conditions"""
-
-    def _calculate_rsi(prices_df: pd.DataFrame, period: int) -> pd.Series:
-        delta = prices_df["close"].diff()
-        gain = (delta.where(delta > 0, 0)).fillna(0)
-        loss = (-delta.where(delta < 0, 0)).fillna(0)
-        avg_gain = gain.rolling(window=period).mean()
-        avg_loss = loss.rolling(window=period).mean()
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-    
-    rsi = _calculate_rsi(prices_df, params["period"])
-    if rsi.iloc[-1] > params["bearish"]:
+    rsi = indicators.rsi(params["period"])
+    if rsi > params["bearish"]:
         signal = Signal.BEARISH
-    elif rsi.iloc[-1] < params["bullish"]:
+    elif rsi < params["bullish"]:
         signal = Signal.BULLISH
     else:
         signal = Signal.NEUTRAL
@@ -175,24 +324,10 @@ def get_rsi_signal(prices_df, params):
     return signal
 
 
-def get_volatility_signal(prices_df, params):
+def get_volatility_signal(indicators: IndicatorEngine, params):
     """Volatility-based trading strategy"""
-    # Calculate various volatility metrics
-    returns = prices_df["close"].pct_change()
-
-    # Historical volatility
-    hist_vol = returns.rolling(21).std() * math.sqrt(252)
-
-    # Volatility regime detection
-    vol_ma = hist_vol.rolling(63).mean()
-    vol_regime = hist_vol / vol_ma
-
-    # Volatility mean reversion
-    vol_z_score = (hist_vol - vol_ma) / hist_vol.rolling(63).std()
-
-    # Generate signal based on volatility regime
-    current_vol_regime = vol_regime.iloc[-1]
-    vol_z = vol_z_score.iloc[-1]
+    # Volatility regime (21-day historical volatility over its 63-day mean) and its z-score
+    current_vol_regime, vol_z = indicators.volatility_regime()
 
     if current_vol_regime < params["bullish"] and vol_z < -1:
         # Low vol regime, potential for expansion
@@ -206,23 +341,20 @@ def get_volatility_signal(prices_df, params):
     return signal
 
 
-def get_volume_analysis(prices_df, params):
+def get_volume_analysis(indicators: IndicatorEngine, params):
     """Analyze volume characteristics"""
-    volume = prices_df['volume']
-    price = prices_df['close']
-    
-    # Calculate volume moving average
-    vol_ma = volume.rolling(window=params["trend"]).mean()
-    
-    # Calculate price-volume relationship
-    price_volume_corr = price.rolling(window=params["correlation"]).corr(volume)
-    
-    # Calculate volume trend
-    vol_trend = (volume > vol_ma.shift(1)).astype(int)
+    volume = indicators.volume()
+
+    # volume moving average, and the previous bar's for the trend
+    vol_ma = indicators.volume_mean(params["trend"])
+    prev_vol_ma = indicators.volume_mean(params["trend"], lag=1)
+
+    # price-volume relationship
+    price_volume_corr = indicators.price_volume_corr(params["correlation"])
     
-    result = f"- Volume trend: {Signal.BULLISH if vol_trend.iloc[-1] == 1 else Signal.BEARISH}\n"
-    result += f"- Price-volume correlation: {price_volume_corr.iloc[-1]}\n"
-    result += f"- Unusual volume: {volume.iloc[-1] > (vol_ma.iloc[-1] * params['unusual_volume'])}\n"
+    result = f"- Volume trend: {Signal.BULLISH if volume > prev_vol_ma else Signal.BEARISH}\n"
+    result += f"- Price-volume correlation: {price_volume_corr}\n"
+    result += f"- Unusual volume: {volume > (vol_ma * params['unusual_volume'])}\n"
     return result
 
 
@@ -247,24 +379,37 @@ def get_support_resistance(prices_df, params):
         # else:
         #     raise ValueError("level_type must be 'support' or 'resistance'")
     
-    def _find_levels(prices: pd.Series, lookback_period: int = params["lookback_period"]):
-        levels = []
-        for i in range(lookback_period, len(prices)):
-            if _is_level(prices, i, 'support'):
-                levels.append((i, prices.iloc[i]))
-            elif _is_level(prices, i, 'resistance'):
-                levels.append((i, prices.iloc[i]))
-        return levels
+    def _find_levels(prices: pd.Series, lookback_period: int = params["lookback_period"], pivot_window: int = params["pivot_window"]):
+        """
+        Pivot test for every bar at once on sliding windows centred on each bar.
+        The series is NaN-padded so windows at the end see only the bars that exist, as the
+        scalar test does. Bars before pivot_window keep the scalar test, whose left slice
+        then differs from a centred window.
+        """
+        values = prices.to_numpy()
+        center = values.astype(float)
+        padding = np.full(pivot_window, np.nan)
+        windows = sliding_window_view(np.concatenate([padding, center, padding]), 2 * pivot_window + 1)
+        left, right = windows[:, :pivot_window], windows[:, pivot_window + 1:]
+        current = center[:, None]
+
+        support = ((left > current).sum(axis=1) >= 2) & ((right > current).sum(axis=1) >= 2)
+        resistance = ((left < current).sum(axis=1) >= 2) & ((right < current).sum(axis=1) >= 2)
+        is_level = support | resistance
+        is_level[:lookback_period] = False
+        for i in range(lookback_period, min(pivot_window, len(prices))):
+            is_level[i] = _is_level(prices, i, 'support') or _is_level(prices, i, 'resistance')
+        return values[is_level]
     
     price_data = prices_df['close']
     current_price = price_data.iloc[-1]
     levels = _find_levels(price_data)
     
-    support_levels = [price for _, price in levels if price < current_price]
-    resistance_levels = [price for _, price in levels if price > current_price]
+    support_levels = levels[levels < current_price]
+    resistance_levels = levels[levels > current_price]
     
-    support = max(support_levels) if support_levels else None
-    resistance = min(resistance_levels) if resistance_levels else None
+    support = support_levels.max() if len(support_levels) else None
+    resistance = resistance_levels.min() if len(resistance_levels) else None
 
     if support is None or resistance is None:
         return "Failed to analyze support and resistance levels"
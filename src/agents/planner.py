@@ -3,7 +3,7 @@ from pydantic import BaseModel, Field
 from agents.registry import AgentRegistry
 from graph.constants import AgentKey
 from llm.prompt import PLANNER_PROMPT
-from llm.inference import agent_call
+from llm.inference import aagent_call
 from util.logger import logger
 
 
@@ -17,7 +17,7 @@ class PlannerOutput(BaseModel):
         default="No justification provided due to error"
     )
 
-def planner_agent(ticker: str, llm_config: Dict[str, Any], workflow_analysts: List[str]) -> List[str]:
+async def planner_agent(ticker: str, llm_config: Dict[str, Any], workflow_analysts: List[str]) -> List[str]:
     """
     Planner agent that decides which analysts to use based on self-knowledge.
     It functions as a pre-requisite for the agentic workflow.
@@ -34,7 +34,7 @@ def planner_agent(ticker: str, llm_config: Dict[str, Any], workflow_analysts: Li
         analysts=analyst_info
     )
 
-    result = agent_call(
+    result = await aagent_call(
         prompt=prompt,
         llm_config=llm_config,
         pydantic_model=PlannerOutput
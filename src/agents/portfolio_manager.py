@@ -1,7 +1,7 @@
 from graph.constants import AgentKey, Action
 from llm.prompt import PORTFOLIO_PROMPT, RISK_CONTROL_PROMPT
 from graph.schema import Decision, FundState, PositionRisk
-from llm.inference import agent_call
+from llm.inference import aagent_call
 from apis.router import Router, APISource
 from util.db_helper import get_db
 from util.logger import logger
@@ -11,7 +11,7 @@ thresholds = {
     "decision_memory_limit": 5
 }
 
-def portfolio_agent(state: FundState):
+async def portfolio_agent(state: FundState):
     """Makes final trading decisions and generates orders"""
     agent_name = AgentKey.PORTFOLIO
     portfolio = state["portfolio"]
@@ -28,17 +28,13 @@ def portfolio_agent(state: FundState):
     # Get price data
     router = Router(APISource.ALPHA_VANTAGE)
     try:
-        current_price = router.get_us_stock_last_close_price(ticker=ticker, trading_date=trading_date)
+        current_price = await router.aget_us_stock_last_close_price(ticker=ticker, trading_date=trading_date)
     except Exception as e:
         logger.error(f"Failed to fetch price data for {ticker}: {e}")
         raise RuntimeError(f"Failed to make decision")
-    
+
     # calculate the max position ratio
-    max_position_ratio = 1
-    if num_tickers > 1:
-        # suppose a single ticker can occupy its own base allocation (1/N) plus that of one other ticker maximally, round to the nearest 0.05
-        max_position_ratio = round(2 / num_tickers * 20) / 20
-    
+    max_position_ratio = get_max_position_ratio(num_tickers)
 
     # risk control
     risk_prompt = RISK_CONTROL_PROMPT.format(
@@ -48,22 +44,15 @@ def portfolio_agent(state: FundState):
 
     )
 
-    position_risk = agent_call(
+    position_risk = await aagent_call(
         prompt=risk_prompt,
         llm_config=llm_config,
         pydantic_model=PositionRisk,
     )
-    
+
     logger.log_agent_status(agent_name, ticker, "Risk control")
     logger.log_risk(ticker, position_risk)
-
-    # verify the position ratio if it is in the range
-    if position_risk.optimal_position_ratio > max_position_ratio:
-        # too bullish, set to the max
-        position_risk.optimal_position_ratio = max_position_ratio
-    elif position_risk.optimal_position_ratio < 0:
-        # too bearish, set to 0
-        position_risk.optimal_position_ratio = 0
+    clamp_position_risk(position_risk, max_position_ratio)
 
     logger.log_agent_status(agent_name, ticker, "Making trading decisions")
 
@@ -80,17 +69,15 @@ def portfolio_agent(state: FundState):
     )
 
     # Generate the trading decision
-    ticker_decision = agent_call(
+    ticker_decision = await aagent_call(
         prompt=prompt,
         llm_config=llm_config,
         pydantic_model=Decision
     )
 
     # post-process the decision due to possible reasoning error
-    ticker_decision.price = current_price
-    if ticker_decision.shares < 0 and ticker_decision.action == Action.SELL:
-        ticker_decision.shares = -ticker_decision.shares
-        
+    fix_decision(ticker_decision, current_price)
+
     # save decision
     logger.log_decision(ticker, ticker_decision)
     db.save_decision(portfolio.id, ticker, prompt, ticker_decision, trading_date)
@@ -98,6 +85,32 @@ def portfolio_agent(state: FundState):
     return {"decision": ticker_decision}
 
 
+def get_max_position_ratio(num_tickers):
+    """max ratio of the portfolio value a single ticker may occupy"""
+    max_position_ratio = 1
+    if num_tickers > 1:
+        # suppose a single ticker can occupy its own base allocation (1/N) plus that of one other ticker maximally, round to the nearest 0.05
+        max_position_ratio = round(2 / num_tickers * 20) / 20
+    return max_position_ratio
+
+
+def clamp_position_risk(position_risk, max_position_ratio):
+    """verify the position ratio if it is in the range"""
+    if position_risk.optimal_position_ratio > max_position_ratio:
+        # too bullish, set to the max
+        position_risk.optimal_position_ratio = max_position_ratio
+    elif position_risk.optimal_position_ratio < 0:
+        # too bearish, set to 0
+        position_risk.optimal_position_ratio = 0
+
+
+def fix_decision(ticker_decision, current_price):
+    """price the decision at the current close and make sell shares positive"""
+    ticker_decision.price = current_price
+    if ticker_decision.shares < 0 and ticker_decision.action == Action.SELL:
+        ticker_decision.shares = -ticker_decision.shares
+
+
 def calculate_ticker_shares(portfolio, current_price, ticker, optimal_position_ratio):
     """calculate the tradable shares for a given ticker based on portfolio"""
 
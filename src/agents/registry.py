@@ -20,6 +20,12 @@ class AgentRegistry:
         AgentKey.POLICY
     ]
 
+    # Market-scoped analysts don't depend on the ticker, they run once per trading date
+    MARKET_ANALYST_KEYS = [
+        AgentKey.MACROECONOMIC,
+        AgentKey.POLICY
+    ]
+
     @classmethod
     def get_agent_func_by_key(cls, key: str) -> Callable:
         """Get agent function by key."""
@@ -35,6 +41,11 @@ class AgentRegistry:
         """Check if an agent key is valid."""
         return key in cls.ANALYST_KEYS
 
+    @classmethod
+    def is_market_analyst(cls, key: str) -> bool:
+        """Check if an analyst is market-scoped rather than ticker-scoped."""
+        return key in cls.MARKET_ANALYST_KEYS
+
     @classmethod
     def get_analyst_info(cls, key: str) -> str:
         """Get analyst info."""
@@ -6,11 +6,87 @@ Premium tier: 75 API requests per minute
 """
 
 import os
+import asyncio
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, wait
 import requests
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-from apis.common_model import OHLCVCandle, MediaNews
+from datetime import datetime, timedelta, timezone
+from apis.common_model import MediaNews
+from apis.rate_limiter import get_rate_limiter, RateLimitExceeded
+from apis.http_client import HttpClient
+from apis.candle_store import CANDLE_DTYPE, get_candle_store
+from apis.insider_store import get_insider_store
+from apis.macro_store import get_macro_store
 from .api_model import InsiderTrade, Fundamentals, MacroEconomic
+from .cache import get_response_cache, last_market_close
+from util.logger import logger
+
+# MacroEconomic field -> Alpha Vantage function
+MACRO_INDICATORS = {
+    "real_gdp": "REAL_GDP",  # default annual
+    "cpi": "CPI",
+    "treasury_yield": "TREASURY_YIELD",
+    "federal_funds_rate": "FEDERAL_FUNDS_RATE",
+    "unemployment": "UNEMPLOYMENT",
+    "nonfarm_payrolls": "NONFARM_PAYROLL",
+}
+# release interval of each macro series (at the default interval), sync is skipped until the next one is due
+MACRO_CADENCE = {
+    "REAL_GDP": timedelta(days=365),
+    "CPI": timedelta(days=30),
+    "TREASURY_YIELD": timedelta(days=30),
+    "FEDERAL_FUNDS_RATE": timedelta(days=30),
+    "UNEMPLOYMENT": timedelta(days=30),
+    "NONFARM_PAYROLL": timedelta(days=30),
+}
+# points before the as-of one that each indicator carries as history
+MACRO_HISTORY_POINTS = int(os.environ.get("ALPHA_VANTAGE_MACRO_HISTORY") or 3)
+# TIME_SERIES_DAILY value fields in CANDLE_DTYPE column order
+_CANDLE_FIELDS = itemgetter("1. open", "2. high", "3. low", "4. close", "5. volume")
+# compact TIME_SERIES_DAILY covers the latest 100 bars, older stores need a full resync
+COMPACT_SPAN = timedelta(days=140)
+# insider history is re-downloaded once a day, or never for dates whose filings are all in
+INSIDER_SYNC_TTL = timedelta(days=1)
+INSIDER_FILING_LAG = timedelta(days=4)  # Form 4 is due within two business days
+# max articles per NEWS_SENTIMENT call, used to pull one market-wide feed for bulk news
+NEWS_FEED_LIMIT = 1000
+# pages of the market-wide feed read for bulk news before falling back to per-ticker calls
+NEWS_FEED_PAGES = int(os.environ.get("ALPHA_VANTAGE_NEWS_FEED_PAGES") or 3)
+# overall deadline in seconds for fetching all macro indicators
+MACRO_DEADLINE = float(os.environ.get("ALPHA_VANTAGE_MACRO_DEADLINE") or 10)
+
+
+def _env_int(key: str, default: int = None) -> int:
+    """Read an optional integer setting from the environment."""
+    value = os.environ.get(key)
+    return int(value) if value else default
+
+
+def _throttle_note(response: requests.Response) -> str:
+    """Alpha Vantage reports rate limiting as a 200 response with a note instead of data; get it lowercased."""
+    if response.status_code != 200:
+        return ""
+    try:
+        payload = response.json()
+    except ValueError:
+        return ""
+    message = str(payload.get("Note") or payload.get("Information") or "") if isinstance(payload, dict) else ""
+    message = message.lower()
+    return message if "rate limit" in message or "requests per" in message or "calls per" in message else ""
+
+
+def _is_quota_exhausted(response: requests.Response) -> bool:
+    """The note of a spent daily quota, which no retry before the next day can get past."""
+    message = _throttle_note(response)
+    return "per day" in message and "per minute" not in message
+
+
+def _is_throttled(response: requests.Response) -> bool:
+    """The note of a per-minute throttle, worth retrying after a backoff."""
+    return bool(_throttle_note(response)) and not _is_quota_exhausted(response)
+
 
 class AlphaVantageAPI:
     """Alpha Vantage API Wrapper."""
@@ -18,80 +94,161 @@ class AlphaVantageAPI:
     def __init__(self):
         self.api_key = os.environ.get("ALPHA_VANTAGE_API_KEY")
         self.entitlement = os.environ.get("ALPHA_VANTAGE_ENTITLEMENT", None) # Premium feature only
-        self.base_url = f"https://www.alphavantage.co/query?apikey={self.api_key}"
+        self.base_url = "https://www.alphavantage.co/query"
+        # sent with every request but kept out of the cache key
+        self.auth_params = {"apikey": self.api_key}
         if self.entitlement:
-            self.base_url += f"&entitlement={self.entitlement}"
+            self.auth_params["entitlement"] = self.entitlement
+        self.cache = get_response_cache()
+        self.candle_store = get_candle_store()
+        self.insider_store = get_insider_store()
+        self.macro_store = get_macro_store()
+        self.http = HttpClient(
+            "alpha_vantage",
+            rate_limiter=get_rate_limiter(
+                "alpha_vantage",
+                per_minute=_env_int("ALPHA_VANTAGE_REQUESTS_PER_MINUTE", 75),
+                per_day=_env_int("ALPHA_VANTAGE_REQUESTS_PER_DAY", None),
+                max_wait=_env_int("ALPHA_VANTAGE_MAX_THROTTLE_WAIT", None),
+            ),
+            is_throttled=_is_throttled,
+            is_exhausted=_is_quota_exhausted,
+        )
+
+    def _request(self, params: dict, timeout: float = None) -> dict:
+        """Send a query to Alpha Vantage, served from the response cache when fresh."""
+        if self.cache:
+            payload = self.cache.get(params)
+            if payload is not None:
+                return payload
 
-    def _get_daily_candles(self, ticker: str, trading_date: datetime) -> list[OHLCVCandle]: 
-        """Get daily candles for a ticker. Filter candles by trading_date."""
-        response = requests.get(
+        response = self.http.get(
             url=self.base_url,
-            params={
-                "function": "TIME_SERIES_DAILY", 
-                "symbol": ticker
-            }
+            params={**self.auth_params, **params},
+            timeout=timeout,
+            label=params["function"]
         )
 
         if response.status_code != 200:
             response.raise_for_status()
-        
-        # parse response into OHLCVCandle objects
-        candle_series = response.json()["Time Series (Daily)"]
-        daily_candles = []
-        
-        for date, data in candle_series.items():
-            candle_date = datetime.strptime(date, "%Y-%m-%d")
-            # Filter by trading_date
-            if candle_date > trading_date:
-                continue
-                
-            candle = OHLCVCandle(
-                date=date,
-                open=float(data["1. open"]),
-                high=float(data["2. high"]),
-                low=float(data["3. low"]),
-                close=float(data["4. close"]),
-                volume=int(data["5. volume"])
-            )
-            daily_candles.append(candle)
-
-        return daily_candles
+
+        payload = response.json()
+        if self.cache:
+            self.cache.set(params, payload)
+        return payload
+
+    async def _arequest(self, params: dict, timeout: float = None) -> dict:
+        """Async counterpart of _request on the pooled async client."""
+        if self.cache:
+            payload = self.cache.get(params)
+            if payload is not None:
+                return payload
+
+        response = await self.http.aget(
+            url=self.base_url,
+            params={**self.auth_params, **params},
+            timeout=timeout,
+            label=params["function"]
+        )
+        response.raise_for_status()
+
+        payload = response.json()
+        if self.cache:
+            self.cache.set(params, payload)
+        return payload
+
+    @staticmethod
+    def _daily_candles_params(ticker: str, outputsize: str) -> dict:
+        return {
+            "function": "TIME_SERIES_DAILY", 
+            "symbol": ticker,
+            "outputsize": outputsize
+        }
+
+    @staticmethod
+    def _parse_daily_candles(payload: dict) -> np.ndarray:
+        """
+        Parse response into a candle array for the store.
+        Columns are converted in bulk: ISO dates straight to datetime64, prices and volumes to one float matrix.
+        """
+        candle_series = payload["Time Series (Daily)"]
+        candles = np.empty(len(candle_series), dtype=CANDLE_DTYPE)
+        if not candle_series:
+            return candles
+
+        candles["date"] = np.array(list(candle_series), dtype="datetime64[D]")
+        # volumes are exact in float64 (< 2**53)
+        values = np.array(list(map(_CANDLE_FIELDS, candle_series.values())), dtype=np.float64)
+        candles["open"] = values[:, 0]
+        candles["high"] = values[:, 1]
+        candles["low"] = values[:, 2]
+        candles["close"] = values[:, 3]
+        candles["volume"] = values[:, 4].astype(np.int64)
+
+        return candles
+
+    def _candles_outputsize(self, ticker: str) -> str:
+        """Full history on first sync or after a long gap, otherwise only the latest bars."""
+        last_date = self.candle_store.last_date(ticker)
+        if last_date is None:
+            return "full"
+        gap = np.datetime64(datetime.now(timezone.utc).date(), "D") - last_date
+        return "compact" if gap < np.timedelta64(COMPACT_SPAN.days, "D") else "full"
+
+    def _candles_need_sync(self, ticker: str, trading_date: datetime) -> bool:
+        """Sync unless the store covers trading_date or was synced after the latest close."""
+        last_date = self.candle_store.last_date(ticker)
+        if last_date is None:
+            return True
+        if last_date >= np.datetime64(trading_date.date(), "D"):
+            return False
+        synced_at = self.candle_store.synced_at(ticker)
+        return synced_at is None or synced_at < last_market_close(datetime.now(timezone.utc))
+
+    def sync_daily_candles(self, ticker: str):
+        """Fetch new daily candles for a ticker and append them to the local store."""
+        outputsize = self._candles_outputsize(ticker)
+        payload = self._request(self._daily_candles_params(ticker, outputsize))
+        if outputsize == "full" and "Time Series (Daily)" not in payload:
+            # full history is a premium feature, fall back to the latest bars
+            payload = self._request(self._daily_candles_params(ticker, "compact"))
+        self.candle_store.append(ticker, self._parse_daily_candles(payload))
     
     def get_last_close_price(self, ticker: str, trading_date: datetime) -> float:
         """Get the last close price for a ticker."""
-        daily_candles = self._get_daily_candles(ticker, trading_date)
-        if daily_candles:
-            return daily_candles[0].close
-
-        return None
+        prices_df = self.get_daily_candles_df(ticker, trading_date)
+        if prices_df.empty:
+            return None
+        return float(prices_df["close"].iloc[-1])
 
     def get_daily_candles_df(self, ticker: str, trading_date: datetime) -> pd.DataFrame:
-        """Convert daily candles into a DataFrame Object with datetime index and numeric columns."""
-        daily_candles = self._get_daily_candles(ticker, trading_date)
-        
-        # Convert list of OHLCVCandle objects to DataFrame
-        df = pd.DataFrame([candle.model_dump() for candle in daily_candles])
-        
-        # Convert date column to datetime and set as index
-        df["Date"] = pd.to_datetime(df["date"])
-        df.set_index("Date", inplace=True)
-        df.drop("date", axis=1, inplace=True)  # Remove original date column
-        
-        # Convert price and volume columns to numeric
-        numeric_cols = ["open", "high", "low", "close", "volume"]
-        for col in numeric_cols:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-            
-        # Sort by date index
-        df.sort_index(inplace=True)
-        
-        return df
+        """Get daily candles up to trading_date from the local store, syncing new bars first."""
+        with self.candle_store.lock(ticker):
+            if self._candles_need_sync(ticker, trading_date):
+                self.sync_daily_candles(ticker)
+        return self.candle_store.get_df(ticker, trading_date)
 
+    async def aget_daily_candles_df(self, ticker: str, trading_date: datetime) -> pd.DataFrame:
+        """Async counterpart of get_daily_candles_df, the locked store sync and file I/O run in a worker thread."""
+        return await asyncio.to_thread(self.get_daily_candles_df, ticker, trading_date)
+
+    def _insider_need_sync(self, ticker: str, trading_date: datetime) -> bool:
+        """
+        Sync unless the store was synced recently, or late enough after trading_date
+        that every trade before it has been filed.
+        """
+        synced_at = self.insider_store.synced_at(ticker)
+        if synced_at is None:
+            return True
+        if trading_date and synced_at >= trading_date.replace(tzinfo=timezone.utc) + INSIDER_FILING_LAG:
+            return False
+        return datetime.now(timezone.utc) - synced_at > INSIDER_SYNC_TTL
 
     def get_insider_trades(self, ticker: str, trading_date: datetime, limit: int=None) -> list[InsiderTrade]:
         """
         Get insider trades for a ticker.
         This API returns the latest and historical insider transactions made by key stakeholders.
+        The history is merged into the local insider store and served from its index.
         
         Args:
             ticker (str): The ticker symbol
@@ -99,49 +256,24 @@ class AlphaVantageAPI:
             trading_date (datetime): Filter trades up to this date
             
         Returns:
-            list[InsiderTrade]: List of insider trades sorted by transaction date
+            list[InsiderTrade]: List of insider trades sorted by transaction date, latest first
         """
-        response = requests.get(
-            url=self.base_url,
-            params={
-                "function": "INSIDER_TRANSACTIONS", 
-                "symbol": ticker
-            }
-        )
-        
-        if response.status_code != 200:
-            response.raise_for_status()
-
-        trades = response.json()["data"]
-
-        # Filter trades by trading_date if provided
-        if trading_date:
-            filtered_trades = []
-            for trade in trades:
-                transaction_date = datetime.strptime(trade["transaction_date"], "%Y-%m-%d")
-                if transaction_date < trading_date:
-                    filtered_trades.append(trade)
-            trades = filtered_trades
-            
-
-        trades = trades[:limit]
-        
+        with self.insider_store.lock(ticker):
+            if self._insider_need_sync(ticker, trading_date):
+                payload = self._request({
+                    "function": "INSIDER_TRANSACTIONS", 
+                    "symbol": ticker
+                })
+                self.insider_store.merge(ticker, payload["data"], lag=INSIDER_FILING_LAG)
+        trades = self.insider_store.latest(ticker, trading_date, limit)
         return [InsiderTrade(**trade) for trade in trades]
 
-    def get_fundamentals(self, ticker: str) -> Fundamentals:
-        """Get company fundamentals from Alpha Vantage."""
-        response = requests.get(
-            url=self.base_url,
-            params={
-                "function": "OVERVIEW", 
-                "symbol": ticker
-            }
-        )
-        if response.status_code != 200:
-            response.raise_for_status()
+    async def aget_insider_trades(self, ticker: str, trading_date: datetime, limit: int=None) -> list[InsiderTrade]:
+        """Async counterpart of get_insider_trades, the locked store sync and sqlite I/O run in a worker thread."""
+        return await asyncio.to_thread(self.get_insider_trades, ticker, trading_date, limit)
 
-        data = response.json()
-        
+    @staticmethod
+    def _parse_fundamentals(data: dict) -> Fundamentals:
         # The field names in data match our model's aliases automatically
         try:
             fundamentals = Fundamentals(**data)  # Automatic field mapping happens here
@@ -150,6 +282,88 @@ class AlphaVantageAPI:
             print(f"Error parsing response: {e}")
             return None
 
+    def get_fundamentals(self, ticker: str) -> Fundamentals:
+        """Get company fundamentals from Alpha Vantage."""
+        data = self._request({
+            "function": "OVERVIEW", 
+            "symbol": ticker
+        })
+        return self._parse_fundamentals(data)
+
+    async def aget_fundamentals(self, ticker: str) -> Fundamentals:
+        """Async counterpart of get_fundamentals."""
+        data = await self._arequest({
+            "function": "OVERVIEW", 
+            "symbol": ticker
+        })
+        return self._parse_fundamentals(data)
+
+    @staticmethod
+    def _news_params(ticker: str = None, topic: str = None, trading_date: datetime = None, limit: int = None) -> dict:
+        params = {"function": "NEWS_SENTIMENT"}
+        
+        if ticker:
+            params["tickers"] = ticker
+        if topic:
+            params["topics"] = topic
+        if trading_date:
+            params["time_to"] = trading_date.strftime("%Y%m%dT%H%M")
+            time_from = trading_date - timedelta(days=7)
+            params["time_from"] = time_from.strftime("%Y%m%dT%H%M")
+        if limit:
+            params["limit"] = limit
+        return params
+
+    @staticmethod
+    def _to_media_news(news: dict, ticker: str = None) -> MediaNews:
+        relevance_score = None
+        if ticker:
+            for ticker_sentiment in news.get("ticker_sentiment", []):
+                if ticker_sentiment["ticker"] == ticker:
+                    relevance_score = float(ticker_sentiment["relevance_score"])
+                    break
+        return MediaNews(
+            title=news["title"],
+            publish_time=news["time_published"],
+            summary=news["summary"],
+            publisher=news["source"],
+            relevance_score=relevance_score
+        )
+
+    @classmethod
+    def _parse_news(cls, payload: dict, limit: int = None, ticker: str = None) -> list[MediaNews]:
+        news_list = []
+        for news in payload["feed"]:
+            news_list.append(cls._to_media_news(news, ticker))
+        return news_list[:limit]
+
+    @classmethod
+    def _demux_news(cls, feed: list[dict], news_by_ticker: dict[str, list[MediaNews]], limit: int):
+        """Route each article of a market-wide feed page to the requested tickers it mentions."""
+        for news in feed:
+            for ticker_sentiment in news.get("ticker_sentiment", []):
+                news_list = news_by_ticker.get(ticker_sentiment["ticker"])
+                if news_list is None or len(news_list) >= limit:
+                    continue
+                # pages overlap on the minute they are split at
+                if any(n.title == news["title"] and n.publish_time == news["time_published"] for n in news_list):
+                    continue
+                news_list.append(cls._to_media_news(news, ticker_sentiment["ticker"]))
+
+    @classmethod
+    def _next_feed_page(cls, payload: dict, news_by_ticker: dict[str, list[MediaNews]], limit: int, time_to: str):
+        """
+        Demux a page of the market-wide feed. Get the time_to of the next, older page, or None
+        once every ticker is full or the page ends inside the window, i.e. the feed covers it.
+        """
+        feed = payload["feed"]
+        cls._demux_news(feed, news_by_ticker, limit)
+        if len(feed) < NEWS_FEED_LIMIT or all(len(news_list) >= limit for news_list in news_by_ticker.values()):
+            return None
+        next_time_to = feed[-1]["time_published"][:13]  # YYYYMMDDTHHMM
+        # a full page within one minute can't be paged past
+        return next_time_to if next_time_to != time_to else ""
+
     def get_news(self, ticker: str = None, topic: str = None, trading_date: datetime = None, limit: int = None) -> list[MediaNews]:
         """
         Get news from Alpha Vantage.
@@ -163,66 +377,135 @@ class AlphaVantageAPI:
         Returns:
             list[MediaNews]: List of news articles
         """
-        params = {"function": "NEWS_SENTIMENT"}
-        
-        if ticker:
-            params["tickers"] = ticker
-        if topic:
-            params["topics"] = topic
-        if trading_date:
-            params["time_to"] = trading_date.strftime("%Y%m%dT%H%M")
-            time_from = trading_date - timedelta(days=7)
-            params["time_from"] = time_from.strftime("%Y%m%dT%H%M")
+        payload = self._request(self._news_params(ticker, topic, trading_date))
+        return self._parse_news(payload, limit, ticker)
 
-        response = requests.get(
-            url=self.base_url,
-            params=params
-        )
+    async def aget_news(self, ticker: str = None, topic: str = None, trading_date: datetime = None, limit: int = None) -> list[MediaNews]:
+        """Async counterpart of get_news."""
+        payload = await self._arequest(self._news_params(ticker, topic, trading_date))
+        return self._parse_news(payload, limit, ticker)
+
+    def get_bulk_news(self, tickers: list[str], trading_date: datetime, limit: int) -> dict[str, list[MediaNews]]:
+        """
+        Get company news for many tickers in as few calls as possible.
+        NEWS_SENTIMENT treats a tickers list as "mentions all of them", so instead the market-wide
+        feed is pulled and demultiplexed by ticker_sentiment, paging back to older articles until
+        it covers the date window or every ticker has `limit` articles. Both feeds are sorted
+        latest first, so each ticker gets exactly its own latest articles. Tickers are fetched
+        individually only if NEWS_FEED_PAGES pages don't reach the start of the window.
         
-        if response.status_code != 200:
-            response.raise_for_status()
+        Returns:
+            dict[str, list[MediaNews]]: ticker -> news articles with relevance scores
+        """
+        news_by_ticker = {ticker: [] for ticker in tickers}
+        params = self._news_params(trading_date=trading_date, limit=NEWS_FEED_LIMIT)
+        time_to = params.get("time_to")
+        for page in range(NEWS_FEED_PAGES):
+            time_to = self._next_feed_page(self._request({**params, "time_to": time_to} if time_to else params), news_by_ticker, limit, time_to)
+            if not time_to:
+                break
 
-        news_list = []
-        for news in response.json()["feed"]:
-            news_list.append(MediaNews(
-                title=news["title"],
-                publish_time=news["time_published"],
-                summary=news["summary"],
-                publisher=news["source"]
-            ))
-        return news_list[:limit]
+        uncovered = [ticker for ticker, news_list in news_by_ticker.items() if len(news_list) < limit] if time_to is not None else []
+        for ticker in uncovered:
+            news_by_ticker[ticker] = self.get_news(ticker=ticker, trading_date=trading_date, limit=limit)
+        logger.info(f"Bulk news for {len(tickers)} tickers in {page + 1 + len(uncovered)} calls")
+        return news_by_ticker
+
+    async def aget_bulk_news(self, tickers: list[str], trading_date: datetime, limit: int) -> dict[str, list[MediaNews]]:
+        """Async counterpart of get_bulk_news, uncovered tickers are fetched concurrently."""
+        news_by_ticker = {ticker: [] for ticker in tickers}
+        params = self._news_params(trading_date=trading_date, limit=NEWS_FEED_LIMIT)
+        time_to = params.get("time_to")
+        for page in range(NEWS_FEED_PAGES):
+            time_to = self._next_feed_page(await self._arequest({**params, "time_to": time_to} if time_to else params), news_by_ticker, limit, time_to)
+            if not time_to:
+                break
+
+        uncovered = [ticker for ticker, news_list in news_by_ticker.items() if len(news_list) < limit] if time_to is not None else []
+        results = await asyncio.gather(
+            *(self.aget_news(ticker=ticker, trading_date=trading_date, limit=limit) for ticker in uncovered)
+        )
+        news_by_ticker.update(zip(uncovered, results))
+        logger.info(f"Bulk news for {len(tickers)} tickers in {page + 1 + len(uncovered)} calls")
+        return news_by_ticker
     
 
-    def get_economic_indicators(self):
+    def get_economic_indicators(self, as_of: datetime = None, deadline: float = MACRO_DEADLINE):
         """
-        Get all economic indicators in one call
+        Get all economic indicators in one call, as of a date (latest if None).
+        Each indicator is the latest point at or before as_of plus its MACRO_HISTORY_POINTS predecessors.
+        Series are synced concurrently; those not back within the deadline are left empty.
         """
-        indicators = {
-            "real_gdp": self._fetch_indicator("REAL_GDP"),  # default annual
-            "cpi": self._fetch_indicator("CPI"),
-            "treasury_yield": self._fetch_indicator("TREASURY_YIELD"),
-            "federal_funds_rate": self._fetch_indicator("FEDERAL_FUNDS_RATE"),
-            "unemployment": self._fetch_indicator("UNEMPLOYMENT"),
-            "nonfarm_payrolls": self._fetch_indicator("NONFARM_PAYROLL"),
+        executor = ThreadPoolExecutor(max_workers=len(MACRO_INDICATORS))
+        futures = {
+            field: executor.submit(self._fetch_indicator, function, as_of) for field, function in MACRO_INDICATORS.items()
         }
+        wait(futures.values(), timeout=deadline)
+        # late responses still land in the macro store, don't block on them
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        indicators = {field: self._indicator_result(field, f) if f.done() else None for field, f in futures.items()}
+        self._log_missing_indicators(indicators, as_of, deadline)
         indicators = {k: v or {} for k, v in indicators.items()}
         
         return MacroEconomic(**indicators)
 
-    def _fetch_indicator(self, function: str) -> dict:
-        """Unified indicator fetcher matching pattern"""
-        try:
-            response = requests.get(
-                url=self.base_url,
-                params={
-                    "function": function
-                },
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("data", [{}])[0]  # test，use first data point，better to use 3 data points
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching {function}: {str(e)}")
+    async def aget_economic_indicators(self, as_of: datetime = None, deadline: float = MACRO_DEADLINE):
+        """Async counterpart of get_economic_indicators, each series syncs under its store lock in a worker thread."""
+        tasks = {
+            field: asyncio.ensure_future(asyncio.to_thread(self._fetch_indicator, function, as_of)) for field, function in MACRO_INDICATORS.items()
+        }
+        _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        for task in pending:
+            task.cancel()
+
+        indicators = {field: self._indicator_result(field, t) if t not in pending else None for field, t in tasks.items()}
+        self._log_missing_indicators(indicators, as_of, deadline)
+        indicators = {k: v or {} for k, v in indicators.items()}
+
+        return MacroEconomic(**indicators)
+
+    @staticmethod
+    def _indicator_result(field: str, future) -> dict:
+        """Result of a finished indicator fetch, or None if it raised, as if it missed the deadline."""
+        error = future.exception()
+        if error is not None:
+            logger.warning(f"Error fetching macro indicator {field}: {error}")
             return None
+        return future.result()
+
+    @staticmethod
+    def _log_missing_indicators(indicators: dict, as_of: datetime, deadline: float):
+        missing = [field for field, v in indicators.items() if not v]
+        if missing:
+            logger.warning(f"Macro indicators unavailable as of {as_of or 'today'} within {deadline}s deadline: {missing}")
+
+    def _macro_need_sync(self, function: str, as_of: datetime) -> bool:
+        """
+        Sync unless the store was synced after as_of, or the next point of the series
+        can't be out yet (its period hasn't ended) or was checked for within the last day.
+        """
+        synced_at = self.macro_store.synced_at(function)
+        if synced_at is None:
+            return True
+        if as_of and synced_at >= as_of.replace(tzinfo=timezone.utc):
+            return False
+        now = datetime.now(timezone.utc)
+        series = self.macro_store.load(function)
+        if len(series):
+            next_due = series["date"][-1] + np.timedelta64(MACRO_CADENCE[function].days, "D")
+            if np.datetime64(now.date(), "D") < next_due:
+                return False
+        return now - synced_at > timedelta(days=1)
 
+    def _fetch_indicator(self, function: str, as_of: datetime = None) -> dict:
+        """Sync the series if due and look up its point as of the date. A failed sync falls back to the stored series."""
+        with self.macro_store.lock(function):
+            if self._macro_need_sync(function, as_of):
+                try:
+                    data = self._request({"function": function}, timeout=10)
+                    if "data" in data:
+                        self.macro_store.save(function, data["data"])
+                except (requests.exceptions.RequestException, RateLimitExceeded) as e:
+                    logger.warning(f"Error fetching {function}: {str(e)}")
+        return self.macro_store.as_of(function, as_of, MACRO_HISTORY_POINTS)
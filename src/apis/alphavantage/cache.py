@@ -0,0 +1,217 @@
+"""
+On-disk response cache for the Alpha Vantage API.
+Responses are keyed by (function, symbol, params) and stored zlib-compressed in SQLite,
+so reruns, retries and parallel experiments share the same payloads without network calls.
+"""
+
+import os
+import json
+import zlib
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from util.logger import logger
+
+# US market close in exchange time
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_CLOSE_HOUR = 16
+
+# TTL in seconds per Alpha Vantage function, None means "until the next market close"
+FUNCTION_TTL = {
+    "TIME_SERIES_DAILY": None,
+    "OVERVIEW": 24 * 3600,
+    "INSIDER_TRANSACTIONS": 24 * 3600,
+    "NEWS_SENTIMENT": 3600,
+    # macro series
+    "REAL_GDP": 7 * 24 * 3600,
+    "CPI": 7 * 24 * 3600,
+    "TREASURY_YIELD": 7 * 24 * 3600,
+    "FEDERAL_FUNDS_RATE": 7 * 24 * 3600,
+    "UNEMPLOYMENT": 7 * 24 * 3600,
+    "NONFARM_PAYROLL": 7 * 24 * 3600,
+}
+DEFAULT_TTL = 3600
+
+# payload keys that Alpha Vantage uses for throttling and errors, never cached
+ERROR_KEYS = ("Note", "Information", "Error Message")
+
+
+def next_market_close(now: datetime) -> datetime:
+    """Get the next weekday market close after now (UTC aware)."""
+    local = now.astimezone(MARKET_TZ)
+    close = local.replace(hour=MARKET_CLOSE_HOUR, minute=0, second=0, microsecond=0)
+    if local >= close:
+        close += timedelta(days=1)
+    while close.weekday() >= 5:  # skip weekend
+        close += timedelta(days=1)
+    return close.astimezone(timezone.utc)
+
+
+def last_market_close(now: datetime) -> datetime:
+    """Get the latest weekday market close at or before now (UTC aware)."""
+    local = now.astimezone(MARKET_TZ)
+    close = local.replace(hour=MARKET_CLOSE_HOUR, minute=0, second=0, microsecond=0)
+    if local < close:
+        close -= timedelta(days=1)
+    while close.weekday() >= 5:  # skip weekend
+        close -= timedelta(days=1)
+    return close.astimezone(timezone.utc)
+
+
+def expires_at(function: str, now: datetime) -> datetime:
+    """Get the expiry time for a response of the given function."""
+    ttl = FUNCTION_TTL.get(function, DEFAULT_TTL)
+    if ttl is None:
+        return next_market_close(now)
+    return now + timedelta(seconds=ttl)
+
+
+class ResponseCache:
+    """SQLite-backed response cache with per-function TTL and size-bounded LRU eviction."""
+
+    def __init__(self, db_path: str, max_bytes: int):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._init_table()
+
+    def _get_connection(self):
+        """Get a database connection."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")  # allow parallel experiments to share the cache
+        return conn
+
+    def _init_table(self):
+        """Create the cache table if it doesn't exist."""
+        conn = self._get_connection()
+        try:
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS response_cache (
+                key VARCHAR(64) PRIMARY KEY,
+                function VARCHAR(50) NOT NULL,
+                symbol VARCHAR(20),
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_response_cache_accessed ON response_cache(accessed_at)')
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(params: dict) -> str:
+        """Hash the request params (function, symbol and the rest) into a cache key."""
+        raw = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, params: dict):
+        """Get a cached payload, or None if missing or expired."""
+        key = self.make_key(params)
+        now = datetime.now(timezone.utc).timestamp()
+        conn = None
+        try:
+            conn = self._get_connection()
+            row = conn.execute(
+                'SELECT payload, expires_at FROM response_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                with self._lock:
+                    self.misses += 1
+                return None
+
+            conn.execute('UPDATE response_cache SET accessed_at = ? WHERE key = ?', (now, key))
+            conn.commit()
+            with self._lock:
+                self.hits += 1
+            return json.loads(zlib.decompress(row[0]))
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+
+    def set(self, params: dict, payload: dict):
+        """Store a payload unless Alpha Vantage flagged it as an error or throttle note."""
+        if not isinstance(payload, dict) or any(k in payload for k in ERROR_KEYS):
+            return
+
+        key = self.make_key(params)
+        now = datetime.now(timezone.utc)
+        blob = zlib.compress(json.dumps(payload).encode())
+        conn = None
+        try:
+            conn = self._get_connection()
+            conn.execute('''
+                INSERT OR REPLACE INTO response_cache (key, function, symbol, payload, size, expires_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                key,
+                params.get("function"),
+                params.get("symbol") or params.get("tickers"),
+                blob,
+                len(blob),
+                expires_at(params.get("function"), now).timestamp(),
+                now.timestamp(),
+            ))
+            self._evict(conn, now.timestamp())
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        expired = conn.execute('DELETE FROM response_cache WHERE expires_at <= ?', (now,)).rowcount
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM response_cache').fetchone()[0]
+        evicted = 0
+        if total > self.max_bytes:
+            rows = conn.execute('SELECT key, size FROM response_cache ORDER BY accessed_at ASC').fetchall()
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                conn.execute('DELETE FROM response_cache WHERE key = ?', (key,))
+                total -= size
+                evicted += 1
+        with self._lock:
+            self.evictions += expired + evicted
+
+    def stats(self) -> dict:
+        """Get hit/miss/eviction counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+# process-wide cache shared by every AlphaVantageAPI instance
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """Get the process-wide response cache, or None if disabled via ALPHA_VANTAGE_CACHE_PATH."""
+    global _cache
+    db_path = os.environ.get("ALPHA_VANTAGE_CACHE_PATH", "assets/alphavantage_cache.db")
+    if not db_path:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            max_mb = float(os.environ.get("ALPHA_VANTAGE_CACHE_MAX_MB", 512))
+            _cache = ResponseCache(db_path, max_bytes=int(max_mb * 1024 * 1024))
+        return _cache
@@ -0,0 +1,110 @@
+"""
+Columnar local OHLCV store.
+One memory-mapped NumPy structured array per ticker, sorted by date, plus a small
+sidecar recording when it was last synced. Reads slice by trading_date with a binary search.
+"""
+
+import os
+import json
+import threading
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+
+CANDLE_DTYPE = np.dtype([
+    ("date", "datetime64[D]"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "i8"),
+])
+PRICE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+class CandleStore:
+    """Per-ticker candle arrays under `root`, appended incrementally."""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def lock(self, ticker: str) -> threading.Lock:
+        """Per-ticker lock so concurrent syncs of one ticker don't race."""
+        with self._locks_lock:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{ticker}.npy")
+
+    def _meta_path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{ticker}.json")
+
+    def load(self, ticker: str) -> np.ndarray:
+        """Load the ticker's candles memory-mapped, empty if never synced."""
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        return np.load(path, mmap_mode="r")
+
+    def last_date(self, ticker: str):
+        """Latest stored candle date, None if empty."""
+        candles = self.load(ticker)
+        return candles["date"][-1] if len(candles) else None
+
+    def synced_at(self, ticker: str):
+        """UTC time of the last sync, None if never synced."""
+        try:
+            with open(self._meta_path(ticker)) as f:
+                return datetime.fromisoformat(json.load(f)["synced_at"])
+        except (FileNotFoundError, KeyError, ValueError):
+            return None
+
+    def append(self, ticker: str, candles: np.ndarray):
+        """Merge candles into the store, keeping dates unique and sorted. Newer rows win."""
+        existing = self.load(ticker)
+        candles = candles.astype(CANDLE_DTYPE)
+        candles = candles[np.argsort(candles["date"], kind="stable")]
+        if len(existing):
+            # keep stored rows not overwritten by the new batch
+            keep = ~np.isin(existing["date"], candles["date"])
+            merged = np.concatenate([existing[keep], candles])
+            merged = merged[np.argsort(merged["date"], kind="stable")]
+        else:
+            merged = candles
+
+        # write to a temp file and swap so readers never see a partial array
+        path = self._path(ticker)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, merged)
+        os.replace(tmp_path, path)
+
+        with open(self._meta_path(ticker), "w") as f:
+            json.dump({"synced_at": datetime.now(timezone.utc).isoformat()}, f)
+
+    def get_df(self, ticker: str, trading_date: datetime) -> pd.DataFrame:
+        """Candles up to and including trading_date, as a DataFrame with a datetime index."""
+        candles = self.load(ticker)
+        end = np.searchsorted(candles["date"], np.datetime64(trading_date.date(), "D"), side="right")
+        window = candles[:end]
+
+        df = pd.DataFrame({col: np.asarray(window[col]) for col in PRICE_COLUMNS})
+        df.index = pd.DatetimeIndex(np.asarray(window["date"]).astype("datetime64[ns]"), name="Date")
+        return df
+
+
+# process-wide store
+_store = None
+_store_lock = threading.Lock()
+
+def get_candle_store() -> CandleStore:
+    """Get the process-wide candle store under MARKET_DATA_DIR."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            root = os.environ.get("MARKET_DATA_DIR", "assets/market_data")
+            _store = CandleStore(os.path.join(root, "candles"))
+        return _store
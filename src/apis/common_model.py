@@ -18,4 +18,5 @@ class MediaNews(BaseModel):
     publish_time: str
     publisher: str
     link: Optional[str] = None
-    summary: Optional[str] = None
\ No newline at end of file
+    summary: Optional[str] = None
+    relevance_score: Optional[float] = None
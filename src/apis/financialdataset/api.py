@@ -4,7 +4,7 @@ Link: https://docs.financialdatasets.ai/introduction
 """
 
 import os
-import requests
+from apis.http_client import HttpClient
 from .api_model import FinancialMetrics, InsiderTrade
 
 class FinancialDatasetAPI:
@@ -13,13 +13,15 @@ class FinancialDatasetAPI:
     def __init__(self):
         self.api_key = os.environ.get("FINANCIAL_DATASETS_API_KEY")
         self.base_url = "https://api.financialdatasets.ai"
+        self.http = HttpClient("financial_datasets")
 
     def get_financial_metrics(self, ticker: str) -> FinancialMetrics:
         """Get a real-time snapshot of key financial metrics and ratios for a ticker."""
-        response = requests.get(
+        response = self.http.get(
             url=f"{self.base_url}/financial-metrics/snapshot", 
             headers={"X-API-KEY": self.api_key}, 
-            params={"ticker": ticker}
+            params={"ticker": ticker},
+            label="financial-metrics"
             )
         if response.status_code != 200:
             response.raise_for_status()
@@ -43,10 +45,11 @@ class FinancialDatasetAPI:
         Returns:
             list[InsiderTrade]: A list of InsiderTrade objects.
         """
-        response = requests.get(
+        response = self.http.get(
             url=f"{self.base_url}/insider-trades", 
             headers={"X-API-KEY": self.api_key}, 
-            params={"ticker": ticker, "limit": limit}
+            params={"ticker": ticker, "limit": limit},
+            label="insider-trades"
             )
         if response.status_code != 200:
             response.raise_for_status()
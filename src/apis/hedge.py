@@ -0,0 +1,200 @@
+"""
+Hedged requests across several API sources.
+The primary source is asked first; if it hasn't answered within its observed p95 latency
+(or fails), the next source is fired too and the first valid answer wins. Per-source
+latency and error rates are tracked per method, and the primary is picked adaptively.
+"""
+
+import os
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Awaitable, Callable
+import pandas as pd
+from apis.http_client import get_histogram
+from util.logger import logger
+
+
+def _env_float(key: str, default: float) -> float:
+    value = os.environ.get(key)
+    return float(value) if value else default
+
+# hedge delay before enough samples exist, and its bounds once they do
+HEDGE_DEFAULT_DELAY = _env_float("ROUTER_HEDGE_DELAY", 2.0)
+HEDGE_MIN_DELAY = 0.05
+HEDGE_MAX_DELAY = _env_float("ROUTER_HEDGE_MAX_DELAY", 10.0)
+# samples a source needs on a method before its stats steer routing
+MIN_SAMPLES = 5
+# seconds of expected latency charged per unit of error rate when ranking sources
+ERROR_PENALTY = 30.0
+
+
+class SourceHealth:
+    """Latency and error rate of one source on one Router method."""
+
+    def __init__(self, source: str, method: str):
+        self.histogram = get_histogram(f"router:{source}:{method}")
+        self.calls = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, ok: bool):
+        self.histogram.observe(seconds)
+        with self._lock:
+            self.calls += 1
+            self.errors += 0 if ok else 1
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            return self.errors / self.calls if self.calls else 0.0
+
+    def p95(self) -> float:
+        return self.histogram.percentile(0.95)
+
+    def score(self) -> float:
+        """Expected cost in seconds, lower is better."""
+        return self.p95() + ERROR_PENALTY * self.error_rate
+
+
+_health: dict[tuple[str, str], SourceHealth] = {}
+_health_lock = threading.Lock()
+# sync hedges run on a shared pool; a losing thread can't be interrupted, its result is dropped
+_executor = ThreadPoolExecutor(max_workers=int(_env_float("ROUTER_HEDGE_WORKERS", 16)), thread_name_prefix="hedge")
+
+def get_source_health(source: str, method: str) -> SourceHealth:
+    with _health_lock:
+        if (source, method) not in _health:
+            _health[(source, method)] = SourceHealth(source, method)
+        return _health[(source, method)]
+
+def rank_sources(sources: list[str], method: str) -> list[str]:
+    """Order sources by observed cost once every one has enough samples, else keep the configured order."""
+    health = [get_source_health(source, method) for source in sources]
+    if any(h.calls < MIN_SAMPLES for h in health):
+        return list(sources)
+    order = sorted(range(len(sources)), key=lambda i: (health[i].score(), i))
+    return [sources[i] for i in order]
+
+def hedge_delay(source: str, method: str) -> float:
+    """How long to wait on a source before hedging: its p95, or the default until it has samples."""
+    health = get_source_health(source, method)
+    if health.calls < MIN_SAMPLES:
+        return HEDGE_DEFAULT_DELAY
+    return min(max(health.p95(), HEDGE_MIN_DELAY), HEDGE_MAX_DELAY)
+
+def is_valid(value: Any) -> bool:
+    """A usable answer: not None and not empty."""
+    if value is None:
+        return False
+    if isinstance(value, pd.DataFrame):
+        return not value.empty
+    if isinstance(value, (list, dict)):
+        return len(value) > 0
+    return True
+
+
+def _timed(source: str, method: str, fetch: Callable[[], Any]) -> Any:
+    start = time.perf_counter()
+    try:
+        value = fetch()
+    except Exception:
+        get_source_health(source, method).record(time.perf_counter() - start, ok=False)
+        raise
+    get_source_health(source, method).record(time.perf_counter() - start, ok=is_valid(value))
+    return value
+
+async def _atimed(source: str, method: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    start = time.perf_counter()
+    try:
+        value = await fetch()
+    except asyncio.CancelledError:
+        raise  # a cancelled loser is neither a success nor an error
+    except Exception:
+        get_source_health(source, method).record(time.perf_counter() - start, ok=False)
+        raise
+    get_source_health(source, method).record(time.perf_counter() - start, ok=is_valid(value))
+    return value
+
+
+def hedged_call(method: str, fetches: dict[str, Callable[[], Any]]) -> Any:
+    """
+    Call the ranked sources with hedging and return the first valid answer.
+    A source is added when the ones in flight have all failed or the newest one
+    exceeded its hedge delay. If no answer is valid, the last answer is returned,
+    or the last error is re-raised.
+    """
+    sources = rank_sources(list(fetches), method)
+    pending = {}
+    last_value, last_error = None, None
+    next_source = 0
+
+    while True:
+        if next_source < len(sources):
+            source = sources[next_source]
+            next_source += 1
+            pending[_executor.submit(_timed, source, method, fetches[source])] = source
+            timeout = hedge_delay(source, method) if next_source < len(sources) else None
+        elif not pending:
+            break
+        else:
+            timeout = None
+
+        done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            source = pending.pop(future)
+            try:
+                value = future.result()
+            except Exception as e:
+                logger.warning(f"{method} from {source} failed: {e}")
+                last_error = e
+                continue
+            if is_valid(value):
+                for loser in pending:
+                    loser.cancel()
+                return value
+            last_value = value
+
+    if last_value is not None or last_error is None:
+        return last_value
+    raise last_error
+
+async def ahedged_call(method: str, fetches: dict[str, Callable[[], Awaitable[Any]]]) -> Any:
+    """Async counterpart of hedged_call; losing requests are cancelled."""
+    sources = rank_sources(list(fetches), method)
+    pending = {}
+    last_value, last_error = None, None
+    next_source = 0
+
+    try:
+        while True:
+            if next_source < len(sources):
+                source = sources[next_source]
+                next_source += 1
+                pending[asyncio.ensure_future(_atimed(source, method, fetches[source]))] = source
+                timeout = hedge_delay(source, method) if next_source < len(sources) else None
+            elif not pending:
+                break
+            else:
+                timeout = None
+
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                source = pending.pop(task)
+                try:
+                    value = task.result()
+                except Exception as e:
+                    logger.warning(f"{method} from {source} failed: {e}")
+                    last_error = e
+                    continue
+                if is_valid(value):
+                    return value
+                last_value = value
+    finally:
+        for loser in pending:
+            loser.cancel()
+
+    if last_value is not None or last_error is None:
+        return last_value
+    raise last_error
@@ -0,0 +1,240 @@
+"""
+Pooled HTTP layer shared by the API clients.
+One keep-alive session per thread (one async client per event loop), connect/read
+timeouts on every call, exponential backoff with full jitter on 5xx and throttle
+responses, and per-endpoint latency histograms.
+"""
+
+import os
+import time
+import random
+import bisect
+import asyncio
+import threading
+import weakref
+from typing import Callable, Optional
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from apis.rate_limiter import RateLimiter, RateLimitExceeded
+from util.logger import logger
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# latency histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60]
+
+
+def _env_float(key: str, default: float) -> float:
+    value = os.environ.get(key)
+    return float(value) if value else default
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with percentile estimates."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            self.total += 1
+            self.sum += seconds
+            self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile."""
+        with self._lock:
+            if not self.total:
+                return 0.0
+            rank = q * self.total
+            seen = 0
+            for i, count in enumerate(self.counts):
+                seen += count
+                if seen >= rank:
+                    return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else self.max
+            return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.total,
+            "mean": round(self.sum / self.total, 3) if self.total else 0.0,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": round(self.max, 3),
+        }
+
+
+# keep-alive sessions per thread (requests.Session isn't thread-safe) and process-wide histograms
+_sessions = threading.local()
+_session_lock = threading.Lock()
+_histograms: dict[str, LatencyHistogram] = {}
+
+def get_session() -> requests.Session:
+    """Get the calling thread's keep-alive session, pool size from HTTP_POOL_SIZE."""
+    session = getattr(_sessions, "session", None)
+    if session is None:
+        pool_size = int(_env_float("HTTP_POOL_SIZE", 20))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _sessions.session = session
+    return session
+
+# one httpx.AsyncClient and concurrency semaphore per event loop
+_async_pools = weakref.WeakKeyDictionary()
+
+def get_async_pool() -> tuple[httpx.AsyncClient, asyncio.Semaphore]:
+    """
+    Get the pooled async client and semaphore for the running event loop.
+    Pool size from HTTP_POOL_SIZE, in-flight cap from HTTP_MAX_CONCURRENCY.
+    """
+    loop = asyncio.get_running_loop()
+    with _session_lock:
+        if loop not in _async_pools:
+            pool_size = int(_env_float("HTTP_POOL_SIZE", 20))
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+            )
+            semaphore = asyncio.Semaphore(int(_env_float("HTTP_MAX_CONCURRENCY", 32)))
+            _async_pools[loop] = (client, semaphore)
+        return _async_pools[loop]
+
+async def aclose_async_pool():
+    """Close the pooled async client of the running event loop, before the loop ends."""
+    with _session_lock:
+        pool = _async_pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool[0].aclose()
+
+def get_histogram(label: str) -> LatencyHistogram:
+    """Get the latency histogram for an endpoint label."""
+    with _session_lock:
+        return _histograms.setdefault(label, LatencyHistogram())
+
+def get_latency_summary() -> dict[str, dict]:
+    """Get latency percentiles for every endpoint seen so far."""
+    with _session_lock:
+        histograms = dict(_histograms)
+    return {label: h.summary() for label, h in histograms.items()}
+
+
+class HttpClient:
+    """HTTP client for one API: pooled per-thread session, optional rate limiter, throttle and quota detection."""
+
+    def __init__(self, name: str, rate_limiter: Optional[RateLimiter] = None,
+                 is_throttled: Optional[Callable[[requests.Response], bool]] = None,
+                 is_exhausted: Optional[Callable[[requests.Response], bool]] = None):
+        self.name = name
+        self.rate_limiter = rate_limiter
+        self.is_throttled = is_throttled
+        self.is_exhausted = is_exhausted
+        self.timeout = (
+            _env_float("HTTP_CONNECT_TIMEOUT", 5),
+            _env_float("HTTP_READ_TIMEOUT", 30),
+        )
+        self.max_retries = int(_env_float("HTTP_MAX_RETRIES", 3))
+        self.backoff_base = _env_float("HTTP_BACKOFF_BASE", 1.0)
+        self.backoff_max = _env_float("HTTP_BACKOFF_MAX", 30.0)
+
+    def should_retry(self, response) -> bool:
+        """Retry on 5xx, 429 and API-specific throttle responses."""
+        return response.status_code in RETRY_STATUS or (
+            self.is_throttled is not None and self.is_throttled(response)
+        )
+
+    def check_exhausted(self, response, label: str):
+        """Fail fast on a spent daily quota, and stop later requests in the limiter until it resets."""
+        if self.is_exhausted is None or not self.is_exhausted(response):
+            return
+        if self.rate_limiter:
+            self.rate_limiter.exhaust()
+        raise RateLimitExceeded(f"{label} daily quota exhausted")
+
+    def backoff(self, attempt: int, response=None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when the server sends it."""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def get(self, url: str, params: dict = None, headers: dict = None,
+            timeout: float = None, label: str = None) -> requests.Response:
+        """
+        Send a GET request with retries.
+        The last response is returned even if still throttled; connection errors are re-raised.
+        """
+        label = f"{self.name}:{label}" if label else self.name
+        histogram = get_histogram(label)
+        session = get_session()
+
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+
+            start = time.perf_counter()
+            try:
+                response = session.get(url, params=params, headers=headers, timeout=timeout or self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                histogram.observe(time.perf_counter() - start)
+                if attempt == self.max_retries:
+                    raise
+                wait = self.backoff(attempt)
+                logger.warning(f"{label} request failed ({e}), retry {attempt + 1}/{self.max_retries} in {wait:.1f}s")
+                time.sleep(wait)
+                continue
+            histogram.observe(time.perf_counter() - start)
+            self.check_exhausted(response, label)
+
+            if not self.should_retry(response) or attempt == self.max_retries:
+                return response
+
+            wait = self.backoff(attempt, response)
+            logger.warning(f"{label} returned {response.status_code} or throttle note, retry {attempt + 1}/{self.max_retries} in {wait:.1f}s")
+            time.sleep(wait)
+
+        return response
+
+    async def aget(self, url: str, params: dict = None, headers: dict = None,
+                   timeout: float = None, label: str = None) -> httpx.Response:
+        """Async counterpart of get, bounded by the per-loop concurrency semaphore."""
+        label = f"{self.name}:{label}" if label else self.name
+        histogram = get_histogram(label)
+        client, semaphore = get_async_pool()
+        if timeout is None:
+            timeout = httpx.Timeout(self.timeout[1], connect=self.timeout[0])
+
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter:
+                await self.rate_limiter.aacquire()
+
+            start = time.perf_counter()
+            try:
+                async with semaphore:
+                    response = await client.get(url, params=params, headers=headers, timeout=timeout)
+            except httpx.TransportError as e:
+                histogram.observe(time.perf_counter() - start)
+                if attempt == self.max_retries:
+                    raise
+                wait = self.backoff(attempt)
+                logger.warning(f"{label} request failed ({e}), retry {attempt + 1}/{self.max_retries} in {wait:.1f}s")
+                await asyncio.sleep(wait)
+                continue
+            histogram.observe(time.perf_counter() - start)
+            self.check_exhausted(response, label)
+
+            if not self.should_retry(response) or attempt == self.max_retries:
+                return response
+
+            wait = self.backoff(attempt, response)
+            logger.warning(f"{label} returned {response.status_code} or throttle note, retry {attempt + 1}/{self.max_retries} in {wait:.1f}s")
+            await asyncio.sleep(wait)
+
+        return response
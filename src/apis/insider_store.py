@@ -0,0 +1,134 @@
+"""
+Local insider-trade history.
+One SQLite table of transactions indexed by (ticker, transaction_date), merged incrementally
+from INSIDER_TRANSACTIONS over a trailing filing-lag window, so "latest N trades before a date"
+is an index range scan.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+
+# InsiderTrade fields, in column order
+TRADE_COLUMNS = [
+    "transaction_date", "ticker", "executive", "executive_title",
+    "security_type", "acquisition_or_disposal", "shares", "share_price",
+]
+
+
+class InsiderStore:
+    """Insider transactions of every synced ticker in one SQLite file."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self._init_table()
+
+    def lock(self, ticker: str) -> threading.Lock:
+        """Per-ticker lock so concurrent syncs of one ticker don't race."""
+        with self._locks_lock:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _get_connection(self):
+        """Get a database connection."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_table(self):
+        """Create the tables if they don't exist."""
+        conn = self._get_connection()
+        try:
+            conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS insider_trade (
+                {", ".join(f"{col} TEXT" for col in TRADE_COLUMNS)},
+                seq INTEGER NOT NULL
+            )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_insider_trade_ticker_date ON insider_trade(ticker, transaction_date)')
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS insider_sync (
+                ticker VARCHAR(20) PRIMARY KEY,
+                synced_at TEXT NOT NULL
+            )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def synced_at(self, ticker: str):
+        """UTC time of the last sync, None if never synced."""
+        conn = self._get_connection()
+        try:
+            row = conn.execute('SELECT synced_at FROM insider_sync WHERE ticker = ?', (ticker,)).fetchone()
+        finally:
+            conn.close()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def merge(self, ticker: str, trades: list[dict], lag: timedelta = timedelta(0)):
+        """
+        Merge a downloaded history into the store.
+        Trades from `lag` before the latest stored date onwards are replaced as a whole, since
+        filings for that window may have arrived after the previous sync; older ones are kept.
+        seq keeps the feed order of trades sharing a date.
+        """
+        conn = self._get_connection()
+        try:
+            last_date = conn.execute(
+                'SELECT MAX(transaction_date) FROM insider_trade WHERE ticker = ?', (ticker,)
+            ).fetchone()[0]
+            cutoff = None
+            if last_date is not None:
+                cutoff = (datetime.strptime(last_date[:10], "%Y-%m-%d") - lag).strftime("%Y-%m-%d")
+            rows = [
+                tuple({**trade, "ticker": ticker}.get(col) for col in TRADE_COLUMNS) + (seq,)
+                for seq, trade in enumerate(trades)
+                if cutoff is None or trade["transaction_date"] >= cutoff
+            ]
+            if cutoff is not None:
+                conn.execute('DELETE FROM insider_trade WHERE ticker = ? AND transaction_date >= ?', (ticker, cutoff))
+            conn.executemany(
+                f'INSERT INTO insider_trade ({", ".join(TRADE_COLUMNS)}, seq) VALUES ({", ".join("?" * (len(TRADE_COLUMNS) + 1))})',
+                rows
+            )
+            conn.execute(
+                'INSERT OR REPLACE INTO insider_sync (ticker, synced_at) VALUES (?, ?)',
+                (ticker, datetime.now(timezone.utc).isoformat())
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def latest(self, ticker: str, before: datetime = None, limit: int = None) -> list[dict]:
+        """Latest `limit` trades dated strictly before `before`, newest first."""
+        query = f'SELECT {", ".join(TRADE_COLUMNS)} FROM insider_trade WHERE ticker = ?'
+        params = [ticker]
+        if before:
+            query += ' AND transaction_date < ?'
+            params.append(before.strftime("%Y-%m-%d"))
+        query += ' ORDER BY transaction_date DESC, seq ASC LIMIT ?'
+        params.append(limit if limit is not None else -1)
+
+        conn = self._get_connection()
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+        return [dict(zip(TRADE_COLUMNS, row)) for row in rows]
+
+
+# process-wide store
+_store = None
+_store_lock = threading.Lock()
+
+def get_insider_store() -> InsiderStore:
+    """Get the process-wide insider store under MARKET_DATA_DIR."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            root = os.environ.get("MARKET_DATA_DIR", "assets/market_data")
+            _store = InsiderStore(os.path.join(root, "insider.db"))
+        return _store
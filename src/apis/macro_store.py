@@ -0,0 +1,104 @@
+"""
+Local macro-economic series store.
+One NumPy structured array per indicator (date, value as published), sorted by date,
+plus a sidecar recording when it was last synced. As-of lookups are a binary search.
+"""
+
+import os
+import json
+import threading
+import numpy as np
+from datetime import datetime, timezone
+
+# values are kept as the strings Alpha Vantage publishes ("." marks a missing point)
+MACRO_DTYPE = np.dtype([
+    ("date", "datetime64[D]"),
+    ("value", "U32"),
+])
+
+
+class MacroStore:
+    """Per-indicator series arrays under `root`, replaced wholesale on sync since releases get revised."""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def lock(self, function: str) -> threading.Lock:
+        """Per-series lock so concurrent syncs of one series don't race."""
+        with self._locks_lock:
+            return self._locks.setdefault(function, threading.Lock())
+
+    def _path(self, function: str) -> str:
+        return os.path.join(self.root, f"{function}.npy")
+
+    def _meta_path(self, function: str) -> str:
+        return os.path.join(self.root, f"{function}.json")
+
+    def load(self, function: str) -> np.ndarray:
+        """Load the series, empty if never synced."""
+        path = self._path(function)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=MACRO_DTYPE)
+        return np.load(path)
+
+    def synced_at(self, function: str):
+        """UTC time of the last sync, None if never synced."""
+        try:
+            with open(self._meta_path(function)) as f:
+                return datetime.fromisoformat(json.load(f)["synced_at"])
+        except (FileNotFoundError, KeyError, ValueError):
+            return None
+
+    def save(self, function: str, points: list[dict]):
+        """Replace the series with a downloaded history of {"date", "value"} points."""
+        series = np.empty(len(points), dtype=MACRO_DTYPE)
+        if points:
+            series["date"] = np.array([p["date"] for p in points], dtype="datetime64[D]")
+            series["value"] = [p["value"] for p in points]
+            series = series[np.argsort(series["date"], kind="stable")]
+
+        # write to a temp file and swap so readers never see a partial array
+        path = self._path(function)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, series)
+        os.replace(tmp_path, path)
+
+        with open(self._meta_path(function), "w") as f:
+            json.dump({"synced_at": datetime.now(timezone.utc).isoformat()}, f)
+
+    def as_of(self, function: str, as_of: datetime = None, history: int = 0) -> dict:
+        """
+        Latest point dated at or before as_of (the latest overall if None), as {"date", "value"},
+        with the `history` points before it, latest first. Empty if no point qualifies.
+        """
+        series = self.load(function)
+        end = len(series)
+        if as_of is not None:
+            end = np.searchsorted(series["date"], np.datetime64(as_of.date(), "D"), side="right")
+        if end == 0:
+            return {}
+
+        def point(i):
+            return {"date": str(series["date"][i]), "value": str(series["value"][i])}
+
+        latest = point(end - 1)
+        latest["history"] = [point(i) for i in range(end - 2, max(end - 2 - history, -1), -1)]
+        return latest
+
+
+# process-wide store
+_store = None
+_store_lock = threading.Lock()
+
+def get_macro_store() -> MacroStore:
+    """Get the process-wide macro store under MARKET_DATA_DIR."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            root = os.environ.get("MARKET_DATA_DIR", "assets/market_data")
+            _store = MacroStore(os.path.join(root, "macro"))
+        return _store
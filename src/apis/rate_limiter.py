@@ -0,0 +1,118 @@
+"""
+Process-wide token-bucket rate limiting for external data APIs.
+Each caller reserves a token up front and waits for its slot, so bursts from
+parallel analyst branches are spread out instead of coming back throttled.
+"""
+
+import time
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when waiting for a token would exceed the configured max wait."""
+
+
+class TokenBucket:
+    """Token bucket holding `capacity` tokens, refilled evenly over `period` seconds."""
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self) -> float:
+        """Seconds until the next token is available (0 if available now)."""
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """Rate limiter enforcing a per-minute and a per-day budget."""
+
+    def __init__(self, name: str, per_minute: Optional[int] = None, per_day: Optional[int] = None,
+                 max_wait: Optional[float] = None):
+        self.name = name
+        self.max_wait = max_wait
+        self.buckets = []
+        if per_minute:
+            self.buckets.append(TokenBucket(per_minute, 60))
+        if per_day:
+            self.buckets.append(TokenBucket(per_day, 86400))
+
+        self._lock = threading.Lock()
+        # wall-clock time until which the provider reported the daily quota spent
+        self.exhausted_until: Optional[datetime] = None
+        self.requests = 0
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+
+    def _reserve(self) -> float:
+        """Take a token from every bucket and return how long the caller must wait for it."""
+        with self._lock:
+            if self.exhausted_until is not None and datetime.now(timezone.utc) < self.exhausted_until:
+                raise RateLimitExceeded(f"{self.name} daily quota exhausted until {self.exhausted_until:%Y-%m-%d %H:%M} UTC")
+            now = time.monotonic()
+            for bucket in self.buckets:
+                bucket.refill(now)
+            wait = max((bucket.wait_time() for bucket in self.buckets), default=0.0)
+            if self.max_wait is not None and wait > self.max_wait:
+                raise RateLimitExceeded(f"{self.name} rate limit: next slot in {wait:.0f}s exceeds max wait {self.max_wait:.0f}s")
+            for bucket in self.buckets:
+                bucket.tokens -= 1
+            self.requests += 1
+            if wait > 0:
+                self.throttled += 1
+                self.throttled_seconds += wait
+            return wait
+
+    def exhaust(self):
+        """Fail every request until the next UTC midnight, after the provider reported its daily quota spent."""
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            self.exhausted_until = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), timezone.utc)
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        """Wait without blocking the event loop until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def stats(self) -> dict:
+        """Get request and throttling counters."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "throttled_seconds": round(self.throttled_seconds, 2),
+            }
+
+
+# limiters are shared by name across the process
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(name: str, per_minute: Optional[int] = None, per_day: Optional[int] = None,
+                     max_wait: Optional[float] = None) -> RateLimiter:
+    """Get the process-wide limiter for name, creating it with the given budget on first use."""
+    with _limiters_lock:
+        if name not in _limiters:
+            _limiters[name] = RateLimiter(name, per_minute, per_day, max_wait)
+        return _limiters[name]
+
+def get_all_rate_limiters() -> dict[str, RateLimiter]:
+    """Get all limiters created so far."""
+    with _limiters_lock:
+        return dict(_limiters)
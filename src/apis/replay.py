@@ -0,0 +1,113 @@
+"""
+Record/replay of Router responses for deterministic, network-free runs.
+An archive is a directory holding data.bin (zlib-compressed pickles, appended)
+and index.json (key -> offset, length). Keys are the Router method and its arguments.
+"""
+
+import os
+import json
+import mmap
+import zlib
+import pickle
+import threading
+from util.logger import logger
+
+
+def make_key(method: str, args: tuple) -> str:
+    """Stable archive key for a Router call."""
+    return f"{method}|{json.dumps(list(args), default=str)}"
+
+
+class ReplayArchive:
+    """Read/append access to a response archive."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data_path = os.path.join(path, "data.bin")
+        self.index_path = os.path.join(path, "index.json")
+        self.index: dict[str, list[int]] = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        self._lock = threading.Lock()
+        self._mmap = None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    def get(self, method: str, args: tuple):
+        """Load a recorded response from the memory-mapped data file."""
+        key = make_key(method, args)
+        if key not in self.index:
+            raise KeyError(f"No recorded response for {key} in {self.path}")
+        with self._lock:
+            if self._mmap is None:
+                with open(self.data_path, "rb") as f:
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        offset, length = self.index[key]
+        return pickle.loads(zlib.decompress(self._mmap[offset:offset + length]))
+
+    def put(self, method: str, args: tuple, value):
+        """Append a response unless the key is already recorded."""
+        key = make_key(method, args)
+        if key in self.index:
+            return
+        blob = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            if key in self.index:
+                return
+            os.makedirs(self.path, exist_ok=True)
+            with open(self.data_path, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(blob)
+            self.index[key] = [offset, len(blob)]
+
+    def save(self):
+        """Persist the index, written to a temp file and swapped in."""
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.index, f)
+            os.replace(tmp_path, self.index_path)
+
+
+class ReplayAPI:
+    """API source serving every Router call from an archive, no network."""
+
+    def __init__(self, archive: ReplayArchive):
+        self.archive = archive
+
+    def get(self, method: str, args: tuple):
+        return self.archive.get(method, args)
+
+
+# global variables set in main.py
+recorder = None
+replay_archive = None
+
+def replay_initialize(record_dir: str = None, replay_dir: str = None):
+    """Enable recording of Router responses to record_dir, or replaying them from replay_dir."""
+    global recorder, replay_archive
+    if record_dir:
+        recorder = ReplayArchive(record_dir)
+        logger.info(f"Recording API responses to {record_dir}")
+    if replay_dir:
+        if not os.path.exists(os.path.join(replay_dir, "index.json")):
+            raise ValueError(f"No replay archive found at {replay_dir}")
+        replay_archive = ReplayArchive(replay_dir)
+        logger.info(f"Replaying API responses from {replay_dir} ({len(replay_archive.index)} entries)")
+
+def replay_release():
+    """Flush the recording index."""
+    if recorder:
+        recorder.save()
+        logger.info(f"Recorded {len(recorder.index)} API responses to {recorder.path}")
+
+def get_recorder():
+    """Get the active recorder, None if not recording."""
+    return recorder
+
+def get_replay_archive():
+    """Get the active replay archive, None if not replaying."""
+    return replay_archive
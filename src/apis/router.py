@@ -1,51 +1,245 @@
 """Router for APIs"""
 
+from datetime import datetime, timedelta
+from typing import Awaitable
 from apis import YFinanceAPI, AlphaVantageAPI
+from apis.common_model import MediaNews
+from apis.hedge import hedged_call, ahedged_call
+from apis.replay import ReplayAPI, get_recorder, get_replay_archive
+from util.run_cache import get_run_cache
 
 class APISource:
     YFINANCE = "yfinance"
     ALPHA_VANTAGE = "alpha_vantage"
+    REPLAY = "replay"
+
+# Router methods each source can serve, None means all of them
+SOURCE_METHODS = {
+    APISource.YFINANCE: {"us_stock_news", "market_news"},
+    APISource.ALPHA_VANTAGE: None,
+}
+# YFinance search only returns current news, so it stands in for backtest dates older than this
+YFINANCE_NEWS_MAX_AGE = timedelta(days=3)
+
+
+def published_by(news: list[MediaNews], trading_date: datetime) -> list[MediaNews]:
+    """
+    Drop news published after trading_date. Applied to YFinance, which ignores the date,
+    as Alpha Vantage already stops at it; near-date runs get no look-ahead from either source.
+    """
+    if not trading_date:
+        return news
+    cutoff = trading_date.strftime("%Y-%m-%d %H:%M:%S")
+    return [item for item in news if item.publish_time <= cutoff]
+
+async def apublished_by(news: Awaitable[list[MediaNews]], trading_date: datetime) -> list[MediaNews]:
+    """Async counterpart of published_by, on a pending fetch."""
+    return published_by(await news, trading_date)
 
 class Router():
-    """Router for APIs"""
+    """
+    Router for APIs. Every get_* method has an async aget_* counterpart.
+    Given a list of sources, methods that several of them serve are hedged across them (see apis.hedge).
+    When a replay archive is active every Router serves from it, whatever source was asked for.
+    """
     
-    def __init__(self, source: APISource):
-        if source == APISource.YFINANCE:
-            self.api = YFinanceAPI()
-        elif source == APISource.ALPHA_VANTAGE:
-            self.api = AlphaVantageAPI()
+    def __init__(self, source: APISource | list[APISource]):
+        sources = list(source) if isinstance(source, (list, tuple)) else [source]
+        if get_replay_archive() is not None:
+            sources = [APISource.REPLAY]
+
+        self.sources = sources
+        self.apis = {}
+        for src in sources:
+            if src == APISource.YFINANCE:
+                self.apis[src] = YFinanceAPI()
+            elif src == APISource.ALPHA_VANTAGE:
+                self.apis[src] = AlphaVantageAPI()
+            elif src == APISource.REPLAY:
+                archive = get_replay_archive()
+                if archive is None:
+                    raise ValueError("Replay source requires a replay archive, see apis.replay.replay_initialize")
+                self.apis[src] = ReplayAPI(archive)
+            else:
+                raise ValueError(f"Invalid API source: {src}")
+
+        # the first source is the primary, and composite routers key the run cache on the whole list
+        self.source = sources[0] if len(sources) == 1 else tuple(sources)
+        self.api = self.apis[sources[0]]
+
+    def _eligible_sources(self, method: str, trading_date: datetime = None) -> list[APISource]:
+        """Sources that can serve method for trading_date, in configured order."""
+        eligible = []
+        for src in self.sources:
+            methods = SOURCE_METHODS.get(src)
+            if methods is not None and method not in methods:
+                continue
+            if src == APISource.YFINANCE and trading_date and datetime.now() - trading_date > YFINANCE_NEWS_MAX_AGE:
+                continue
+            eligible.append(src)
+        return eligible
+
+    def _fetch(self, method: str, fetch, trading_date: datetime = None):
+        """Fetch from the only eligible source, or hedge across several. fetch takes an API instance."""
+        sources = self._eligible_sources(method, trading_date)
+        if not sources:
+            raise ValueError(f"No source in {self.sources} serves {method}")
+        if len(sources) == 1:
+            return fetch(self.apis[sources[0]])
+        return hedged_call(method, {src: (lambda api=self.apis[src]: fetch(api)) for src in sources})
+
+    async def _afetch(self, method: str, fetch, trading_date: datetime = None):
+        """Async counterpart of _fetch."""
+        sources = self._eligible_sources(method, trading_date)
+        if not sources:
+            raise ValueError(f"No source in {self.sources} serves {method}")
+        if len(sources) == 1:
+            return await fetch(self.apis[sources[0]])
+        return await ahedged_call(method, {src: (lambda api=self.apis[src]: fetch(api)) for src in sources})
+
+    def _call(self, method: str, args: tuple, fetch, trading_date: datetime = None):
+        """
+        Resolve a call: replay archive, else the run cache (when a workflow run is active)
+        falling back to fetch. Responses are recorded when recording is on.
+        """
+        if self.source == APISource.REPLAY:
+            return self.api.get(method, args)
+
+        cache = get_run_cache()
+        if cache is None:
+            value = self._fetch(method, fetch, trading_date)
+        else:
+            value = cache.get_or_fetch((self.source, method, *args), lambda: self._fetch(method, fetch, trading_date))
+
+        recorder = get_recorder()
+        if recorder:
+            recorder.put(method, args, value)
+        return value
+
+    async def _acall(self, method: str, args: tuple, fetch, trading_date: datetime = None):
+        """Async counterpart of _call, sharing the same keys."""
+        if self.source == APISource.REPLAY:
+            return self.api.get(method, args)
+
+        cache = get_run_cache()
+        if cache is None:
+            value = await self._afetch(method, fetch, trading_date)
         else:
-            raise ValueError(f"Invalid API source: {source}")
+            value = await cache.aget_or_fetch((self.source, method, *args), lambda: self._afetch(method, fetch, trading_date))
+
+        recorder = get_recorder()
+        if recorder:
+            recorder.put(method, args, value)
+        return value
     
     def get_us_stock_news(self, ticker, trading_date, news_count):
-        """Get news for a ticker"""
-        if isinstance(self.api, AlphaVantageAPI):
-            return self.api.get_news(ticker=ticker, trading_date=trading_date, limit=news_count)
-        else:  # YFinanceAPI
-            return self.api.get_news(query=ticker, news_count=news_count)
+        """Get news for a ticker, served from the run cache when prefetched."""
+        def fetch(api):
+            if isinstance(api, AlphaVantageAPI):
+                return api.get_news(ticker=ticker, trading_date=trading_date, limit=news_count)
+            return published_by(api.get_news(query=ticker, news_count=news_count), trading_date)  # YFinanceAPI
+        return self._call("us_stock_news", (ticker, trading_date, news_count), fetch, trading_date)
+
+    async def aget_us_stock_news(self, ticker, trading_date, news_count):
+        """Get news for a ticker, served from the run cache when prefetched."""
+        def fetch(api):
+            if isinstance(api, AlphaVantageAPI):
+                return api.aget_news(ticker=ticker, trading_date=trading_date, limit=news_count)
+            return apublished_by(api.aget_news(query=ticker, news_count=news_count), trading_date)  # YFinanceAPI
+        return await self._acall("us_stock_news", (ticker, trading_date, news_count), fetch, trading_date)
+
+    def prefetch_us_stock_news(self, tickers, trading_date, news_count):
+        """Bulk-fetch news for many tickers into the run cache, for get_us_stock_news to serve."""
+        cache = get_run_cache()
+        if cache is None or not isinstance(self.api, AlphaVantageAPI):
+            return
+        news_by_ticker = self.api.get_bulk_news(tickers, trading_date, news_count)
+        for ticker, news in news_by_ticker.items():
+            cache.set((self.source, "us_stock_news", ticker, trading_date, news_count), news)
+
+    async def aprefetch_us_stock_news(self, tickers, trading_date, news_count):
+        """Bulk-fetch news for many tickers into the run cache, for get_us_stock_news to serve."""
+        cache = get_run_cache()
+        if cache is None or not isinstance(self.api, AlphaVantageAPI):
+            return
+        news_by_ticker = await self.api.aget_bulk_news(tickers, trading_date, news_count)
+        for ticker, news in news_by_ticker.items():
+            cache.set((self.source, "us_stock_news", ticker, trading_date, news_count), news)
     
     def get_market_news(self, topic, trading_date, news_count):
         """Get market news for a topic."""
-        if isinstance(self.api, AlphaVantageAPI):
-            return self.api.get_news(topic=topic, trading_date=trading_date, limit=news_count)
-        else:  # YFinanceAPI
-            return self.api.get_news(query=topic, news_count=news_count)
+        def fetch(api):
+            if isinstance(api, AlphaVantageAPI):
+                return api.get_news(topic=topic, trading_date=trading_date, limit=news_count)
+            return published_by(api.get_news(query=topic, news_count=news_count), trading_date)  # YFinanceAPI
+        return self._call("market_news", (topic, trading_date, news_count), fetch, trading_date)
+
+    async def aget_market_news(self, topic, trading_date, news_count):
+        """Get market news for a topic."""
+        def fetch(api):
+            if isinstance(api, AlphaVantageAPI):
+                return api.aget_news(topic=topic, trading_date=trading_date, limit=news_count)
+            return apublished_by(api.aget_news(query=topic, news_count=news_count), trading_date)  # YFinanceAPI
+        return await self._acall("market_news", (topic, trading_date, news_count), fetch, trading_date)
 
     def get_us_stock_insider_trades(self, ticker, trading_date, limit):
-        return self.api.get_insider_trades(ticker, trading_date, limit)
+        return self._call(
+            "insider_trades", (ticker, trading_date, limit),
+            lambda api: api.get_insider_trades(ticker, trading_date, limit)
+        )
+
+    async def aget_us_stock_insider_trades(self, ticker, trading_date, limit):
+        return await self._acall(
+            "insider_trades", (ticker, trading_date, limit),
+            lambda api: api.aget_insider_trades(ticker, trading_date, limit)
+        )
     
     def get_us_stock_daily_candles_df(self, ticker, trading_date):
-        return self.api.get_daily_candles_df(ticker, trading_date)
+        """Get daily candles up to trading_date, fetched once per run. Treat the frame as read-only."""
+        return self._call(
+            "daily_candles_df", (ticker, trading_date),
+            lambda api: api.get_daily_candles_df(ticker, trading_date)
+        )
+
+    async def aget_us_stock_daily_candles_df(self, ticker, trading_date):
+        """Get daily candles up to trading_date, fetched once per run. Treat the frame as read-only."""
+        return await self._acall(
+            "daily_candles_df", (ticker, trading_date),
+            lambda api: api.aget_daily_candles_df(ticker, trading_date)
+        )
     
     def get_us_stock_last_close_price(self, ticker, trading_date):
-        """Get the last close price for a ticker"""
-        return self.api.get_last_close_price(ticker, trading_date)
+        """Get the last close price for a ticker from the run-scoped candle frame."""
+        prices_df = self.get_us_stock_daily_candles_df(ticker, trading_date)
+        if prices_df.empty:
+            return None
+        return float(prices_df["close"].iloc[-1])
+
+    async def aget_us_stock_last_close_price(self, ticker, trading_date):
+        """Get the last close price for a ticker from the run-scoped candle frame."""
+        prices_df = await self.aget_us_stock_daily_candles_df(ticker, trading_date)
+        if prices_df.empty:
+            return None
+        return float(prices_df["close"].iloc[-1])
 
     def get_us_stock_fundamentals(self, ticker):
         """Get fundamentals for a ticker"""
-        return self.api.get_fundamentals(ticker)
+        return self._call("fundamentals", (ticker,), lambda api: api.get_fundamentals(ticker))
+
+    async def aget_us_stock_fundamentals(self, ticker):
+        """Get fundamentals for a ticker"""
+        return await self._acall("fundamentals", (ticker,), lambda api: api.aget_fundamentals(ticker))
     
-    def get_us_economic_indicators(self):
-        """Get economic indicators."""
-        return self.api.get_economic_indicators()
+    def get_us_economic_indicators(self, trading_date=None):
+        """Get economic indicators as of trading_date, one snapshot per run shared by every ticker."""
+        return self._call(
+            "economic_indicators", (trading_date,),
+            lambda api: api.get_economic_indicators(as_of=trading_date)
+        )
 
+    async def aget_us_economic_indicators(self, trading_date=None):
+        """Get economic indicators as of trading_date, one snapshot per run shared by every ticker."""
+        return await self._acall(
+            "economic_indicators", (trading_date,),
+            lambda api: api.aget_economic_indicators(as_of=trading_date)
+        )
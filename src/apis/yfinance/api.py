@@ -3,6 +3,7 @@ YFinance API client implementation.
 Link: https://yfinance-python.org/
 """
 
+import asyncio
 import yfinance as yf
 from typing import Optional
 from datetime import datetime
@@ -30,3 +31,7 @@ class YFinanceAPI:
             ))
 
         return news_list
+
+    async def aget_news(self, query: str, news_count: int) -> list[MediaNews]:
+        """Async counterpart of get_news. yfinance is blocking, so it runs in a worker thread."""
+        return await asyncio.to_thread(self.get_news, query, news_count)
@@ -0,0 +1,89 @@
+"""
+Microbenchmark: TIME_SERIES_DAILY payload -> candle DataFrame cut at trading_date.
+Compares the former per-row path (strptime + OHLCVCandle + model_dump + to_numeric)
+with the columnar parse used by the candle store.
+
+Run from src/: python -m benchmark.candle_parse
+"""
+
+import random
+import timeit
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from apis.common_model import OHLCVCandle
+from apis.alphavantage.api import AlphaVantageAPI
+from apis.candle_store import PRICE_COLUMNS
+
+
+def make_payload(num_bars: int) -> dict:
+    """Synthetic TIME_SERIES_DAILY payload, latest bar first like Alpha Vantage."""
+    series = {}
+    date = datetime(2025, 4, 1)
+    price = 100.0
+    for _ in range(num_bars):
+        price *= 1 + random.gauss(0, 0.01)
+        series[date.strftime("%Y-%m-%d")] = {
+            "1. open": f"{price:.4f}",
+            "2. high": f"{price * 1.01:.4f}",
+            "3. low": f"{price * 0.99:.4f}",
+            "4. close": f"{price:.4f}",
+            "5. volume": str(random.randint(10**5, 10**7)),
+        }
+        date -= timedelta(days=1)
+    return {"Time Series (Daily)": series}
+
+
+def per_row_path(payload: dict, trading_date: datetime) -> pd.DataFrame:
+    """The former _get_daily_candles + get_daily_candles_df."""
+    daily_candles = []
+    for date, data in payload["Time Series (Daily)"].items():
+        if datetime.strptime(date, "%Y-%m-%d") > trading_date:
+            continue
+        daily_candles.append(OHLCVCandle(
+            date=date,
+            open=float(data["1. open"]),
+            high=float(data["2. high"]),
+            low=float(data["3. low"]),
+            close=float(data["4. close"]),
+            volume=int(data["5. volume"])
+        ))
+    df = pd.DataFrame([candle.model_dump() for candle in daily_candles])
+    df["Date"] = pd.to_datetime(df["date"])
+    df.set_index("Date", inplace=True)
+    df.drop("date", axis=1, inplace=True)
+    for col in PRICE_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    df.sort_index(inplace=True)
+    return df
+
+
+def columnar_path(payload: dict, trading_date: datetime) -> pd.DataFrame:
+    """Columnar parse, sort and binary-search cut, as done by the candle store."""
+    candles = AlphaVantageAPI._parse_daily_candles(payload)
+    candles = candles[np.argsort(candles["date"], kind="stable")]
+    end = np.searchsorted(candles["date"], np.datetime64(trading_date.date(), "D"), side="right")
+    window = candles[:end]
+    df = pd.DataFrame({col: window[col] for col in PRICE_COLUMNS})
+    df.index = pd.DatetimeIndex(window["date"].astype("datetime64[ns]"), name="Date")
+    return df
+
+
+def main():
+    random.seed(0)
+    trading_date = datetime(2025, 1, 2)
+    print(f"{'bars':>8} {'per-row ms':>12} {'columnar ms':>12} {'speedup':>8}")
+    for num_bars in (100, 1000, 5000, 20000):
+        payload = make_payload(num_bars)
+        pd.testing.assert_frame_equal(
+            per_row_path(payload, trading_date), columnar_path(payload, trading_date),
+            check_freq=False, check_index_type=False  # index resolution differs across pandas versions
+        )
+        number = max(1, 20000 // num_bars)
+        slow = min(timeit.repeat(lambda: per_row_path(payload, trading_date), number=number, repeat=3)) / number
+        fast = min(timeit.repeat(lambda: columnar_path(payload, trading_date), number=number, repeat=3)) / number
+        print(f"{num_bars:>8} {slow * 1e3:>12.2f} {fast * 1e3:>12.2f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
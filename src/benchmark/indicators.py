@@ -0,0 +1,102 @@
+"""
+Benchmark: replaying consecutive trading dates through the technical signals.
+Compares recomputing every indicator from the full history each date (the former
+pandas path) with advancing the streaming indicator engine by one bar per date.
+
+Run from src/: python -m benchmark.indicators
+"""
+
+import os
+import math
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+os.environ["MARKET_DATA_DIR"] = tempfile.mkdtemp()
+
+from agents.analysts.technical import (
+    thresholds, get_trend_signal, get_mean_reversion_signal, get_rsi_signal,
+    get_volatility_signal, get_volume_analysis
+)
+from util.indicators import IndicatorSnapshot, get_indicators
+
+
+def make_prices(num_bars: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, num_bars)))
+    volume = rng.integers(10**5, 10**7, num_bars)
+    index = pd.DatetimeIndex(pd.bdate_range("2000-01-03", periods=num_bars), name="Date")
+    return pd.DataFrame({"close": close, "volume": volume}, index=index)
+
+
+def full_recompute(prices_df: pd.DataFrame) -> IndicatorSnapshot:
+    """The former indicators: EMAs, rolling stats, RSI, volatility regime and volume over the whole history."""
+    close, volume = prices_df["close"], prices_df["volume"]
+    p = thresholds
+    values = {"close": close.iloc[-1], "volume": volume.iloc[-1]}
+    for span in p["trend"].values():
+        values[("ema", span)] = close.ewm(span=span, adjust=False).mean().iloc[-1]
+    for window in (p["mean_reversion"]["bollinger_window"], p["mean_reversion"]["rolling_window"]):
+        values[("rolling_mean_std", window)] = (close.rolling(window).mean().iloc[-1], close.rolling(window).std().iloc[-1])
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).fillna(0).rolling(p["rsi"]["period"]).mean()
+    loss = (-delta.where(delta < 0, 0)).fillna(0).rolling(p["rsi"]["period"]).mean()
+    values[("rsi", p["rsi"]["period"])] = (100 - 100 / (1 + gain / loss)).iloc[-1]
+    hist_vol = close.pct_change().rolling(21).std() * math.sqrt(252)
+    vol_ma, vol_std = hist_vol.rolling(63).mean(), hist_vol.rolling(63).std()
+    values["volatility_regime"] = ((hist_vol / vol_ma).iloc[-1], ((hist_vol - vol_ma) / vol_std).iloc[-1])
+    vol_trend = volume.rolling(p["volume"]["trend"]).mean()
+    values[("volume_mean", p["volume"]["trend"], 0)] = vol_trend.iloc[-1]
+    values[("volume_mean", p["volume"]["trend"], 1)] = vol_trend.iloc[-2]
+    window = p["volume"]["correlation"]
+    values[("price_volume_corr", window)] = close.rolling(window).corr(volume.astype(float)).iloc[-1]
+    return IndicatorSnapshot(values)
+
+
+def get_signals(indicators) -> list:
+    return [
+        get_trend_signal(indicators, thresholds["trend"]),
+        get_mean_reversion_signal(indicators, thresholds["mean_reversion"]),
+        get_rsi_signal(indicators, thresholds["rsi"]),
+        get_volatility_signal(indicators, thresholds["volatility"]),
+        get_volume_analysis(indicators, thresholds["volume"]),
+    ]
+
+
+def assert_same_signals(expected: list, actual: list, label):
+    """Same signals from both paths; the price-volume correlation is printed as a float, compare it with a tolerance."""
+    assert expected[:4] == actual[:4], (label, expected[:4], actual[:4])
+    for want, got in zip(expected[4].splitlines(), actual[4].splitlines()):
+        if want.startswith("- Price-volume correlation:"):
+            want, got = float(want.split(": ")[1]), float(got.split(": ")[1])
+            assert math.isclose(want, got, rel_tol=1e-6, abs_tol=1e-9) or (math.isnan(want) and math.isnan(got)), (label, want, got)
+        else:
+            assert want == got, (label, want, got)
+
+
+def main():
+    print(f"{'history':>8} {'dates':>6} {'recompute s':>12} {'streaming s':>12} {'speedup':>8}")
+    for num_bars, num_dates in ((1000, 250), (5000, 250), (20000, 250)):
+        prices_df = make_prices(num_bars)
+        first = num_bars - num_dates
+
+        start = time.perf_counter()
+        expected = [get_signals(full_recompute(prices_df.iloc[:end + 1])) for end in range(first, num_bars)]
+        slow = time.perf_counter() - start
+
+        # warm the engine state up to the first replayed date, as a prior run would have
+        ticker = f"BENCH{num_bars}"
+        get_indicators(ticker, prices_df.iloc[:first], thresholds)
+        start = time.perf_counter()
+        actual = [get_signals(get_indicators(ticker, prices_df.iloc[:end + 1], thresholds)) for end in range(first, num_bars)]
+        fast = time.perf_counter() - start
+
+        for date, want, got in zip(prices_df.index[first:], expected, actual):
+            assert_same_signals(want, got, date)
+
+        print(f"{num_bars:>8} {num_dates:>6} {slow:>12.2f} {fast:>12.2f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Microbenchmark: support/resistance detection in the technical analyst.
+Compares the former per-bar pandas scan with the sliding-window implementation
+and checks both produce identical output.
+
+Run from src/: python -m benchmark.support_resistance
+"""
+
+import timeit
+import numpy as np
+import pandas as pd
+from agents.analysts.technical import get_support_resistance, thresholds
+
+
+def make_prices(num_bars: int, seed: int = 0) -> pd.DataFrame:
+    """Random-walk close prices, rounded so ties between bars occur like in real quotes."""
+    rng = np.random.default_rng(seed)
+    close = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.01, num_bars))), 2)
+    return pd.DataFrame({"close": close})
+
+
+def per_bar_path(prices_df, params):
+    """The former get_support_resistance."""
+    def _is_level(prices: pd.Series, i: int, level_type: str, pivot_window: int = params["pivot_window"]) -> bool:
+        start_idx = max(0, i - pivot_window)
+        end_idx = min(len(prices), i + pivot_window + 1)
+        window_prices = prices.iloc[start_idx:end_idx]
+        current_price = prices.iloc[i]
+        
+        left_prices = window_prices.iloc[:pivot_window]
+        right_prices = window_prices.iloc[pivot_window+1:]
+        
+        if level_type == 'support':
+            return (len(left_prices[left_prices > current_price]) >= 2 and 
+                   len(right_prices[right_prices > current_price]) >= 2)
+        elif level_type == 'resistance':
+            return (len(left_prices[left_prices < current_price]) >= 2 and 
+                   len(right_prices[right_prices < current_price]) >= 2)
+    
+    def _find_levels(prices: pd.Series, lookback_period: int = params["lookback_period"]):
+        levels = []
+        for i in range(lookback_period, len(prices)):
+            if _is_level(prices, i, 'support'):
+                levels.append((i, prices.iloc[i]))
+            elif _is_level(prices, i, 'resistance'):
+                levels.append((i, prices.iloc[i]))
+        return levels
+    
+    price_data = prices_df['close']
+    current_price = price_data.iloc[-1]
+    levels = _find_levels(price_data)
+    
+    support_levels = [price for _, price in levels if price < current_price]
+    resistance_levels = [price for _, price in levels if price > current_price]
+    
+    support = max(support_levels) if support_levels else None
+    resistance = min(resistance_levels) if resistance_levels else None
+
+    if support is None or resistance is None:
+        return "Failed to analyze support and resistance levels"
+    else:
+        result = f"- Current price: {current_price}\n"
+        result += f"- Nearest support: {support}\n"
+        result += f"- Nearest resistance: {resistance}\n"
+        result += f"- Price to support: {(current_price - support) / support}\n"
+        result += f"- Price to resistance: {(resistance - current_price) / current_price}\n"
+        return result
+
+
+def check_identical():
+    """Outputs match on short, tied, NaN-holed series and with lookback shorter than the pivot window."""
+    params_list = [
+        thresholds["support_resistance"],
+        {"pivot_window": 5, "lookback_period": 2},
+        {"pivot_window": 3, "lookback_period": 0},
+    ]
+    for params in params_list:
+        for seed in range(20):
+            for num_bars in (1, 4, 12, 60, 300):
+                prices_df = make_prices(num_bars, seed)
+                if seed % 3 == 0 and num_bars > 4:
+                    prices_df.loc[prices_df.index[num_bars // 2], "close"] = np.nan
+                if seed % 5 == 1:
+                    prices_df["close"] = prices_df["close"].round(0)
+                assert per_bar_path(prices_df, params) == get_support_resistance(prices_df, params), (params, seed, num_bars)
+
+
+def main():
+    check_identical()
+    params = thresholds["support_resistance"]
+    print(f"{'bars':>8} {'per-bar ms':>12} {'vectorized ms':>14} {'speedup':>8}")
+    for num_bars in (1000, 10000, 100000):
+        prices_df = make_prices(num_bars)
+        assert per_bar_path(prices_df, params) == get_support_resistance(prices_df, params)
+        number = max(1, 10000 // num_bars)
+        slow = min(timeit.repeat(lambda: per_bar_path(prices_df, params), number=number, repeat=1 if num_bars >= 100000 else 3)) / number
+        fast = min(timeit.repeat(lambda: get_support_resistance(prices_df, params), number=number, repeat=3)) / number
+        print(f"{num_bars:>8} {slow * 1e3:>12.2f} {fast * 1e3:>14.2f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: technical indicators for a whole universe on one trading date.
+Compares building each ticker's indicators on its own (a fresh streaming engine per
+ticker, i.e. no stored state) with one panel pass over all tickers.
+
+Run from src/: python -m benchmark.technical_panel
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from agents.analysts.technical import thresholds
+from util.indicators import IndicatorEngine, PanelIndicators
+from benchmark.indicators import get_signals, assert_same_signals
+
+
+def make_universe(num_tickers: int, num_bars: int, seed: int = 0) -> dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    index = pd.DatetimeIndex(pd.bdate_range("2015-01-01", periods=num_bars), name="Date")
+    universe = {}
+    for i in range(num_tickers):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, num_bars)))
+        volume = rng.integers(10**5, 10**7, num_bars)
+        universe[f"T{i:04d}"] = pd.DataFrame({"close": close, "volume": volume}, index=index)
+    return universe
+
+
+def per_ticker(universe: dict[str, pd.DataFrame]) -> dict:
+    engines = {}
+    for ticker, df in universe.items():
+        engine = IndicatorEngine(thresholds)
+        for date, close, volume in zip(df.index.strftime("%Y-%m-%d"), df["close"].tolist(), df["volume"].tolist()):
+            engine.update(date, close, volume)
+        engines[ticker] = engine
+    return engines
+
+
+def main():
+    print(f"{'tickers':>8} {'bars':>6} {'per-ticker s':>13} {'panel s':>9} {'speedup':>8}")
+    for num_tickers, num_bars in ((50, 1000), (500, 1000), (500, 5000)):
+        universe = make_universe(num_tickers, num_bars)
+
+        start = time.perf_counter()
+        engines = per_ticker(universe)
+        slow = time.perf_counter() - start
+
+        start = time.perf_counter()
+        panel = PanelIndicators(universe, thresholds)
+        snapshots = {ticker: panel.for_ticker(ticker) for ticker in universe}
+        fast = time.perf_counter() - start
+
+        for ticker in universe:
+            assert_same_signals(get_signals(engines[ticker]), get_signals(snapshots[ticker]), ticker)
+        print(f"{num_tickers:>8} {num_bars:>6} {slow:>13.2f} {fast:>9.3f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
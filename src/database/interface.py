@@ -48,4 +48,12 @@ class BaseDB(ABC):
 
     @abstractmethod
     def get_decision_memory(self, exp_name: str, ticker: str, limit: int) -> list:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_technical_features(self, ticker: str, trading_date: datetime, thresholds_hash: str) -> dict:
+        pass
+
+    @abstractmethod
+    def save_technical_features(self, ticker: str, trading_date: datetime, thresholds_hash: str, features: dict) -> str:
+        pass
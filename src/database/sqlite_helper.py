@@ -384,5 +384,63 @@ class SQLiteDB(BaseDB):
             if conn:
                 conn.close()
 
+    def get_technical_features(self, ticker: str, trading_date: datetime, thresholds_hash: str) -> Optional[Dict]:
+        """Get the technical features of a ticker on a trading date, computed with the given thresholds."""
+        conn = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT trend, mean_reversion, rsi, volatility, volume, price_levels FROM technical_feature
+                WHERE ticker = ? AND trading_date = ? AND thresholds_hash = ?
+            ''', (ticker, trading_date.isoformat(), thresholds_hash))
+
+            row = cursor.fetchone()
+            if row:
+                return dict(row)
+            return None
+        except Exception as e:
+            logger.warning(f"Error getting technical features: {e}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+
+    def save_technical_features(self, ticker: str, trading_date: datetime, thresholds_hash: str, features: Dict) -> Optional[str]:
+        """Save the technical features of a ticker on a trading date, replacing any with the same thresholds."""
+        conn = None
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+
+            feature_id = str(uuid.uuid4())
+            cursor.execute('''
+                INSERT OR REPLACE INTO technical_feature (id, updated_at, ticker, trading_date, thresholds_hash,
+                                  trend, mean_reversion, rsi, volatility, volume, price_levels)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                feature_id,
+                datetime.now(timezone.utc).isoformat(), # UTC time
+                ticker,
+                trading_date.isoformat(),
+                thresholds_hash,
+                str(features['trend']),
+                str(features['mean_reversion']),
+                str(features['rsi']),
+                str(features['volatility']),
+                features['volume'],
+                features['price_levels']
+            ))
+
+            conn.commit()
+            return feature_id
+        except Exception as e:
+            logger.error(f"Error saving technical features: {e}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+
 ## init global instance
 # sqlite_db = SQLiteDB()
\ No newline at end of file
@@ -73,6 +73,24 @@ def init_database():
     )
     ''')
 
+    # Create technical feature table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS technical_feature (
+        id VARCHAR(36) PRIMARY KEY,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        ticker VARCHAR(10) NOT NULL,
+        trading_date TIMESTAMP NOT NULL,
+        thresholds_hash VARCHAR(16) NOT NULL,
+        trend VARCHAR(10) NOT NULL,
+        mean_reversion VARCHAR(10) NOT NULL,
+        rsi VARCHAR(10) NOT NULL,
+        volatility VARCHAR(10) NOT NULL,
+        volume TEXT NOT NULL,
+        price_levels TEXT NOT NULL,
+        UNIQUE (ticker, trading_date, thresholds_hash)
+    )
+    ''')
+
     # Create indices for better query performance
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_config_exp_name ON config(exp_name)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_portfolio_updated ON portfolio(updated_at)')
@@ -83,6 +101,7 @@ def init_database():
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_signal_portfolio ON signal(portfolio_id)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_signal_updated ON signal(updated_at)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_signal_analyst ON signal(analyst)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_technical_feature_trading_date ON technical_feature(trading_date)')
     
     conn.commit()
     conn.close()
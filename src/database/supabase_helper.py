@@ -264,5 +264,47 @@ class SupabaseDB(BaseDB):
             logger.warning(f"No decision memory found for {ticker} in {exp_name}: {e}")
             return []
 
+    def get_technical_features(self, ticker: str, trading_date: datetime, thresholds_hash: str) -> Optional[Dict]:
+        """Get the technical features of a ticker on a trading date, computed with the given thresholds."""
+        try:
+            response = self.client.table('technical_feature') \
+                .select('trend, mean_reversion, rsi, volatility, volume, price_levels') \
+                .eq('ticker', ticker) \
+                .eq('trading_date', trading_date.isoformat()) \
+                .eq('thresholds_hash', thresholds_hash) \
+                .execute()
+
+            return response.data[0] if response.data else None
+        except Exception as e:
+            logger.warning(f"Error getting technical features: {e}")
+            return None
+
+    def save_technical_features(self, ticker: str, trading_date: datetime, thresholds_hash: str, features: Dict) -> Optional[str]:
+        """Save the technical features of a ticker on a trading date, replacing any with the same thresholds."""
+        try:
+            data = {
+                'updated_at': datetime.now(timezone.utc).isoformat(),
+                'ticker': ticker,
+                'trading_date': trading_date.isoformat(),
+                'thresholds_hash': thresholds_hash,
+                'trend': str(features['trend']),
+                'mean_reversion': str(features['mean_reversion']),
+                'rsi': str(features['rsi']),
+                'volatility': str(features['volatility']),
+                'volume': features['volume'],
+                'price_levels': features['price_levels']
+            }
+
+            response = self.client.table('technical_feature') \
+                .upsert(data, on_conflict='ticker,trading_date,thresholds_hash') \
+                .execute()
+
+            if response.data and len(response.data) > 0:
+                return response.data[0]['id']
+            return None
+        except Exception as e:
+            logger.error(f"Error saving technical features: {e}")
+            return None
+
 # Initialize global instance
 # db = SupabaseDB() 
\ No newline at end of file
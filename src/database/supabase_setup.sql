@@ -54,6 +54,22 @@ create table if not exists signal (
     justification text not null
 );
 
+-- Technical feature table
+create table if not exists technical_feature (
+    id uuid primary key default uuid_generate_v4(),
+    updated_at timestamp with time zone default now(),
+    ticker varchar(10) not null,
+    trading_date timestamp with time zone not null,
+    thresholds_hash varchar(16) not null,
+    trend varchar(10) not null,
+    mean_reversion varchar(10) not null,
+    rsi varchar(10) not null,
+    volatility varchar(10) not null,
+    volume text not null,
+    price_levels text not null,
+    unique (ticker, trading_date, thresholds_hash)
+);
+
 -- Create indices
 create index if not exists idx_config_exp_name on config(exp_name);
 create index if not exists idx_portfolio_updated on portfolio(updated_at);
@@ -64,3 +80,4 @@ create index if not exists idx_decision_trading_date on decision(trading_date);
 create index if not exists idx_signal_portfolio on signal(portfolio_id);
 create index if not exists idx_signal_updated on signal(updated_at);
 create index if not exists idx_signal_analyst on signal(analyst);
+create index if not exists idx_technical_feature_trading_date on technical_feature(trading_date);
@@ -0,0 +1,108 @@
+"""
+Pre-run data prefetch.
+Expands (tickers x analysts) into the Router calls the nodes will make, collapses duplicates,
+and issues them concurrently into the run cache, so analyst nodes only spend time on LLM inference.
+"""
+
+import asyncio
+from typing import Dict, List, NamedTuple
+from datetime import datetime
+from graph.constants import AgentKey
+from apis.router import Router, APISource
+from agents.analysts.company_news import thresholds as company_news_thresholds
+from agents.analysts.insider import thresholds as insider_thresholds
+from agents.analysts.policy import thresholds as policy_thresholds, FISCAL_TOPIC, MONETARY_TOPIC
+from util.logger import logger
+
+NEWS_SOURCES = (APISource.ALPHA_VANTAGE, APISource.YFINANCE)
+AV_SOURCES = (APISource.ALPHA_VANTAGE,)
+
+
+class DataRequest(NamedTuple):
+    """One Router call: sources the node's Router is built with, method name without the get_ prefix, args."""
+    sources: tuple
+    method: str
+    args: tuple
+
+
+def plan_prefetch(ticker_analysts: Dict[str, List[str]], trading_date: datetime) -> List[DataRequest]:
+    """
+    Get the deduplicated Router calls for a run, in first-needed order.
+    Must mirror the calls each agent makes, with the same sources and arguments, to hit the run cache.
+    """
+    requests = {}
+
+    def need(sources, method, *args):
+        requests.setdefault(DataRequest(sources, method, args), None)
+
+    for ticker, analysts in ticker_analysts.items():
+        for analyst in analysts:
+            if analyst == AgentKey.TECHNICAL:
+                need(AV_SOURCES, "us_stock_daily_candles_df", ticker, trading_date)
+            elif analyst == AgentKey.FUNDAMENTAL:
+                need(AV_SOURCES, "us_stock_fundamentals", ticker)
+            elif analyst == AgentKey.INSIDER:
+                need(AV_SOURCES, "us_stock_insider_trades", ticker, trading_date, insider_thresholds["num_trades"])
+            elif analyst == AgentKey.COMPANY_NEWS:
+                need(NEWS_SOURCES, "us_stock_news", ticker, trading_date, company_news_thresholds["news_count"])
+            elif analyst == AgentKey.MACROECONOMIC:
+                need(AV_SOURCES, "us_economic_indicators", trading_date)
+            elif analyst == AgentKey.POLICY:
+                for topic in (FISCAL_TOPIC, MONETARY_TOPIC):
+                    need(NEWS_SOURCES, "market_news", topic, trading_date, policy_thresholds["news_count"])
+        # the portfolio manager prices every ticker off the same candles
+        need(AV_SOURCES, "us_stock_daily_candles_df", ticker, trading_date)
+
+    return list(requests)
+
+
+def _router(routers: Dict[tuple, Router], sources: tuple) -> Router:
+    if sources not in routers:
+        routers[sources] = Router(list(sources))
+    return routers[sources]
+
+
+async def _afetch(routers: Dict[tuple, Router], request: DataRequest):
+    router = _router(routers, request.sources)
+    return await getattr(router, f"aget_{request.method}")(*request.args)
+
+
+async def afetch_requests(requests: List[DataRequest]) -> Dict[str, int]:
+    """
+    Issue the requests concurrently, within the API rate limits, into the run cache.
+    Company news for several tickers is bulk-fetched first. Failures are only logged,
+    the node retries its call lazily.
+    """
+    routers = {}
+    news = [r for r in requests if r.method == "us_stock_news"]
+    others = [r for r in requests if r.method != "us_stock_news"]
+
+    async def _news():
+        if len(news) > 1:
+            router = _router(routers, NEWS_SOURCES)
+            try:
+                _, trading_date, news_count = news[0].args
+                await router.aprefetch_us_stock_news([r.args[0] for r in news], trading_date, news_count)
+            except Exception as e:
+                logger.warning(f"Bulk company news fetch failed, falling back to per-ticker fetch: {e}")
+        # served from the run cache when the bulk fetch covered them
+        return await asyncio.gather(*(_afetch(routers, r) for r in news), return_exceptions=True)
+
+    results = await asyncio.gather(
+        _news(), *(_afetch(routers, r) for r in others), return_exceptions=True
+    )
+    results = list(results[0]) + list(results[1:])
+
+    failed = 0
+    for request, result in zip(news + others, results):
+        if isinstance(result, Exception):
+            failed += 1
+            logger.warning(f"Prefetch of {request.method}{request.args} failed: {result}")
+    return {"requests": len(requests), "failed": failed}
+
+
+async def aprefetch(ticker_analysts: Dict[str, List[str]], trading_date: datetime):
+    """Plan and run the prefetch stage of a run."""
+    requests = plan_prefetch(ticker_analysts, trading_date)
+    stats = await afetch_requests(requests)
+    logger.info(f"Prefetched run data: {stats}")
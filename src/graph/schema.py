@@ -72,8 +72,10 @@ class FundState(TypedDict):
     trading_date: datetime = Field(description="Trading date.")
     ticker: str = Field(description="Ticker in-the-flow.")
     llm_config: Dict[str, Any] = Field(description="LLM configuration.")
+    technical_scoring: Dict[str, Any] = Field(description="Technical analyst scoring configuration.")
     portfolio: Portfolio = Field(description="Portfolio for the fund.")
     num_tickers: int = Field(description="Number of tickers in the fund.")
+    tickers: List[str] = Field(description="Tickers sharing the signal of a market-scoped analyst.")
 
     # updated by workflow
     # ticker -> signal of all analysts
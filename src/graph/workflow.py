@@ -1,10 +1,20 @@
-from typing import  Dict, Any
+import asyncio
+from typing import  Dict, Any, List, Callable
 from langgraph.graph import StateGraph, START, END
 from graph.schema import FundState, Portfolio, Decision, Action, Position
 from graph.constants import AgentKey
 from agents.registry import AgentRegistry
 from agents.planner import planner_agent
+from graph.prefetch import aprefetch
+from agents.analysts.technical import prefetch_technical_signals, get_scoring_config
+from apis.alphavantage.cache import get_response_cache
+from llm.cache import get_llm_cache
+from llm.inference import aclose_http_clients
+from llm.retry import get_retry_stats
+from apis.rate_limiter import get_all_rate_limiters
+from apis.http_client import get_latency_summary, aclose_async_pool
 from util.db_helper import get_db
+from util.run_cache import run_cache_initialize, run_cache_release
 from util.logger import logger
 from time import perf_counter
 
@@ -33,6 +43,8 @@ class AgentWorkflow:
         
         # Initialize workflow configuration
         self.planner_mode = config.get('planner_mode', False)
+        self.technical_panel = config.get('technical_panel', False)
+        self.technical_scoring = get_scoring_config(config.get('technical_scoring'))
         
         # Verify workflow analysts
         if not config.get('workflow_analysts'):
@@ -49,20 +61,23 @@ class AgentWorkflow:
             raise ValueError("No valid analysts remaining after validation")
 
 
-    def build(self) -> StateGraph:
-        """Build the workflow"""
+    def build(self, analysts: List[str], portfolio_agent: Callable) -> StateGraph:
+        """Build the async workflow of a ticker's ticker-scoped analysts feeding portfolio_agent"""
         graph = StateGraph(FundState)
         
         # create node for portfolio manager
-        portfolio_agent = AgentRegistry.get_agent_func_by_key(AgentKey.PORTFOLIO)
         graph.add_node(AgentKey.PORTFOLIO, portfolio_agent)
         
-        # create node for each analyst and add edge
-        for analyst in self.current_analysts:
+        # create node for each ticker-scoped analyst and add edge
+        for analyst in analysts:
             agent_func = AgentRegistry.get_agent_func_by_key(analyst)
             graph.add_node(analyst, agent_func)
             graph.add_edge(START, analyst)
             graph.add_edge(analyst, AgentKey.PORTFOLIO)
+
+        # only market-scoped signals for this ticker, go straight to the portfolio manager
+        if not analysts:
+            graph.add_edge(START, AgentKey.PORTFOLIO)
         
         # Route portfolio manager to end
         graph.add_edge(AgentKey.PORTFOLIO, END)
@@ -71,7 +86,7 @@ class AgentWorkflow:
         return workflow 
         
 
-    def load_analysts(self, ticker: str):
+    async def aload_analysts(self, ticker: str) -> List[str]:
         """
         Load the analysts for processing:
         - If planner_mode is True: use planner to select from verified workflow_analysts
@@ -79,59 +94,153 @@ class AgentWorkflow:
         """
         if self.planner_mode:
             logger.info("Using planner agent to select analysts from verified list")
-            self.current_analysts = planner_agent(ticker, self.llm_config, self.workflow_analysts)
-            if not self.current_analysts:
+            analysts = await planner_agent(ticker, self.llm_config, self.workflow_analysts)
+            if not analysts:
                 raise ValueError("No analysts selected by planner")
         else:
             logger.info("Using all verified analysts")
-            self.current_analysts = self.workflow_analysts.copy()
+            analysts = self.workflow_analysts.copy()
             
-        logger.info(f"Active analysts for {ticker}: {self.current_analysts}")
+        logger.info(f"Active analysts for {ticker}: {analysts}")
+        return analysts
+
+    async def arun_market_analysts(self, ticker_analysts: Dict[str, List[str]], portfolio: Portfolio) -> Dict[str, Any]:
+        """
+        Run each market-scoped analyst once for the trading date.
+        Returns analyst key -> AnalystSignal, to be injected into every ticker that selected it.
+        """
+        market_tickers = {}
+        for ticker, analysts in ticker_analysts.items():
+            for analyst in analysts:
+                if AgentRegistry.is_market_analyst(analyst):
+                    market_tickers.setdefault(analyst, []).append(ticker)
+        if not market_tickers:
+            return {}
+
+        async def _run(analyst: str):
+            state = FundState(
+                ticker = None,
+                tickers = market_tickers[analyst],
+                exp_name = self.exp_name,
+                trading_date = self.trading_date,
+                llm_config = self.llm_config,
+                portfolio = portfolio,
+                num_tickers = len(self.tickers)
+            )
+            agent_func = AgentRegistry.get_agent_func_by_key(analyst)
+            return (await agent_func(state)).get("analyst_signals", [])
+
+        logger.info(f"Running market analysts once for all tickers: {list(market_tickers)}")
+        signals = await asyncio.gather(*(_run(analyst) for analyst in market_tickers))
+        results = dict(zip(market_tickers, signals))
+
+        return {analyst: signals[0] for analyst, signals in results.items() if signals}
     
     def run(self, config_id: str) -> float:
         """Run the workflow."""
         start_time = perf_counter()
 
+        # data shared across tickers and agents lives for this run only
+        run_cache_initialize()
+        try:
+            portfolio = asyncio.run(self.arun())
+        finally:
+            run_cache_release()
+
+        logger.log_portfolio("Final Portfolio", portfolio)
+        logger.info("Updating portfolio to Database")
+        portfolio_dict = portfolio.model_dump()
+        self.db.update_portfolio(config_id, portfolio_dict, self.trading_date)
+
+        response_cache = get_response_cache()
+        if response_cache:
+            logger.info(f"Alpha Vantage response cache: {response_cache.stats()}")
+        if self.llm_config.get("cache"):
+            logger.info(f"LLM response cache: {get_llm_cache().stats()}")
+        logger.info(f"LLM retries: {get_retry_stats().stats()}")
+        for name, limiter in get_all_rate_limiters().items():
+            logger.info(f"{name} rate limiter: {limiter.stats()}")
+        for label, latency in get_latency_summary().items():
+            logger.info(f"{label} latency: {latency}")
+
+        end_time = perf_counter()
+        time_cost = end_time - start_time
+
+        return time_cost
+
+    async def arun(self) -> Portfolio:
+        """Run every ticker on one event loop, closing the loop's HTTP clients at the end."""
+        try:
+            return await self.arun_tickers()
+        finally:
+            await aclose_http_clients()
+            await aclose_async_pool()
+
+    async def arun_tickers(self) -> Portfolio:
+        """
+        Run the workflow of every ticker concurrently, returning the updated portfolio.
+        Analysts of all tickers overlap; portfolio managers decide one at a time in ticker
+        order, each on the portfolio updated by the tickers before it.
+        """
         # will be updated by the output of workflow
         portfolio = self.init_portfolio 
-        for ticker in self.tickers:
-            self.load_analysts(ticker)
-            
-            # init FundState
+        if not self.tickers:
+            return portfolio
+
+        # plan analysts for all tickers first so market analysts run once
+        planned = await asyncio.gather(*(self.aload_analysts(ticker) for ticker in self.tickers))
+        ticker_analysts = dict(zip(self.tickers, planned))
+        # fetch every node's data up front so the nodes only run inference
+        await aprefetch(ticker_analysts, self.trading_date)
+        if self.technical_panel:
+            technical_tickers = [t for t, analysts in ticker_analysts.items() if AgentKey.TECHNICAL in analysts]
+            # the panel computation is CPU-bound, keep it off the event loop
+            await asyncio.to_thread(prefetch_technical_signals, technical_tickers, self.trading_date)
+        market_signals = await self.arun_market_analysts(ticker_analysts, portfolio)
+
+        # turns[i] is set once the tickers before the i-th have updated the portfolio
+        turns = [asyncio.Event() for _ in self.tickers]
+        turns[0].set()
+        portfolio_agent = AgentRegistry.get_agent_func_by_key(AgentKey.PORTFOLIO)
+
+        async def _run_ticker(i: int, ticker: str):
+            nonlocal portfolio
+            analysts = ticker_analysts[ticker]
+
+            async def _portfolio_turn(state: FundState):
+                await turns[i].wait()
+                return await portfolio_agent({**state, "portfolio": portfolio})
+
+            # init FundState with the shared market signals
             state = FundState(
                 ticker = ticker,
+                tickers = [ticker],
                 exp_name = self.exp_name,
                 trading_date = self.trading_date,
                 llm_config = self.llm_config,
+                technical_scoring = self.technical_scoring,
                 portfolio = portfolio,
-                num_tickers = len(self.tickers)
+                num_tickers = len(self.tickers),
+                analyst_signals = [market_signals[a] for a in analysts if a in market_signals]
             )
 
             # build the workflow
-            workflow = self.build()
+            workflow = self.build([a for a in analysts if not AgentRegistry.is_market_analyst(a)], _portfolio_turn)
             logger.info(f"{ticker} workflow compiled successfully")
             try:
-                final_state = workflow.invoke(state)
+                final_state = await workflow.ainvoke(state)
             except Exception as e:
                 logger.error(f"Error running deep fund: {e}")
                 raise RuntimeError(f"Failed to generate new portfolio {portfolio.id}")
 
-            # update portfolio
+            # update portfolio and hand the turn to the next ticker
             portfolio = self.update_portfolio_ticker(portfolio, ticker, final_state["decision"])
             logger.log_portfolio(f"{ticker} position update", portfolio)
+            if i + 1 < len(turns):
+                turns[i + 1].set()
 
-            if self.planner_mode:
-                self.current_analysts = None # clean and reset current_analysts
-
-        logger.log_portfolio("Final Portfolio", portfolio)
-        logger.info("Updating portfolio to Database")
-        portfolio_dict = portfolio.model_dump()
-        self.db.update_portfolio(config_id, portfolio_dict, self.trading_date)
-
-        end_time = perf_counter()
-        time_cost = end_time - start_time
-
-        return time_cost
+        await asyncio.gather(*(_run_ticker(i, ticker) for i, ticker in enumerate(self.tickers)))
+        return portfolio
 
 
     def update_portfolio_ticker(self, portfolio: Portfolio, ticker: str, decision: Decision) -> Portfolio:
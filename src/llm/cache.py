@@ -0,0 +1,176 @@
+"""
+Content-addressed LLM response cache for aagent_call.
+Parsed structured outputs are keyed by a hash of (namespace, provider, model, temperature,
+output schema, prompt) and stored in SQLite, so reruns and ablations that ask the same
+questions skip inference.
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+from pydantic import BaseModel
+from util.logger import logger
+
+DEFAULT_NAMESPACE = "default"
+
+
+class LLMCache:
+    """SQLite-backed LLM response cache with per-entry TTL and size-bounded LRU eviction."""
+
+    def __init__(self, db_path: str, max_bytes: int):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_tokens = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._init_table()
+
+    def _get_connection(self):
+        """Get a database connection."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")  # allow parallel experiments to share the cache
+        return conn
+
+    def _init_table(self):
+        """Create the cache table if it doesn't exist."""
+        conn = self._get_connection()
+        try:
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key VARCHAR(64) PRIMARY KEY,
+                namespace VARCHAR(100) NOT NULL,
+                model VARCHAR(100) NOT NULL,
+                output TEXT NOT NULL,
+                tokens INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL
+            )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at)')
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(namespace: str, provider: str, model: str, temperature: Optional[float],
+                 pydantic_model: type[BaseModel], prompt: str) -> str:
+        """Hash everything that determines the answer into a cache key."""
+        raw = json.dumps({
+            "namespace": namespace,
+            "provider": provider,
+            "model": model,
+            "temperature": temperature,
+            "schema": pydantic_model.model_json_schema(),
+            "prompt": prompt,
+        }, sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str, pydantic_model: type[BaseModel]) -> Optional[BaseModel]:
+        """Get a cached output, or None if missing, expired or no longer valid for the model."""
+        now = datetime.now(timezone.utc).timestamp()
+        conn = None
+        try:
+            conn = self._get_connection()
+            row = conn.execute(
+                'SELECT output, tokens, expires_at FROM llm_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or (row[2] is not None and row[2] <= now):
+                with self._lock:
+                    self.misses += 1
+                return None
+
+            output = pydantic_model.model_validate_json(row[0])
+            conn.execute('UPDATE llm_cache SET accessed_at = ? WHERE key = ?', (now, key))
+            conn.commit()
+            with self._lock:
+                self.hits += 1
+                self.saved_tokens += row[1]
+            return output
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            with self._lock:
+                self.misses += 1
+            return None
+        finally:
+            if conn:
+                conn.close()
+
+    def set(self, key: str, namespace: str, model: str, output: BaseModel, tokens: int, ttl: Optional[float]):
+        """Store a parsed output and the tokens it cost; ttl in seconds, None to keep until evicted."""
+        now = datetime.now(timezone.utc).timestamp()
+        payload = output.model_dump_json()
+        conn = None
+        try:
+            conn = self._get_connection()
+            conn.execute('''
+                INSERT OR REPLACE INTO llm_cache (key, namespace, model, output, tokens, size, expires_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                key,
+                namespace,
+                model,
+                payload,
+                tokens,
+                len(payload),
+                now + ttl if ttl is not None else None,
+                now,
+            ))
+            self._evict(conn, now)
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        expired = conn.execute('DELETE FROM llm_cache WHERE expires_at <= ?', (now,)).rowcount
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM llm_cache').fetchone()[0]
+        evicted = 0
+        if total > self.max_bytes:
+            rows = conn.execute('SELECT key, size FROM llm_cache ORDER BY accessed_at ASC').fetchall()
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                conn.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+                total -= size
+                evicted += 1
+        with self._lock:
+            self.evictions += expired + evicted
+
+    def stats(self) -> dict:
+        """Get hit/miss/eviction counters and the tokens hits saved."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "saved_tokens": self.saved_tokens,
+            }
+
+
+# process-wide cache shared by every aagent_call
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_llm_cache() -> LLMCache:
+    """Get the process-wide LLM response cache at LLM_CACHE_PATH."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            db_path = os.environ.get("LLM_CACHE_PATH") or "assets/llm_cache.db"
+            max_mb = float(os.environ.get("LLM_CACHE_MAX_MB", 256))
+            _cache = LLMCache(db_path, max_bytes=int(max_mb * 1024 * 1024))
+        return _cache
@@ -1,10 +1,23 @@
 import os
-from typing import Dict, Any
+import asyncio
+import threading
+import weakref
+from typing import Dict, Any, Optional
 from dataclasses import dataclass
+import httpx
 from pydantic import BaseModel
+from langchain_core.runnables import Runnable
+from langchain_core.language_models.chat_models import BaseChatModel
 from llm.provider import Provider
+from llm.cache import get_llm_cache, DEFAULT_NAMESPACE
+from llm.retry import ErrorKind, ParseError, CallRecord, FATAL_KINDS, classify_error, backoff, reprompt, get_retry_stats
 from util.logger import logger
 
+# connection pool of the HTTP transport shared by all models of a provider
+LLM_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS") or 20)
+# in-flight async calls per LLM provider
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY") or 16)
+
 @dataclass
 class LLMConfig:
     """Configuration for LLM inference"""
@@ -12,6 +25,53 @@ class LLMConfig:
     model: str
     temperature: float = 0.5
     max_retries: int = 3
+    # opt-in response cache, see llm/cache.py
+    cache: bool = False
+    cache_namespace: str = DEFAULT_NAMESPACE
+    cache_ttl: Optional[float] = None  # seconds, None keeps entries until evicted
+
+
+# registries per event loop: a model's async transport is bound to the loop that created it
+_models = weakref.WeakKeyDictionary()
+_structured_models = weakref.WeakKeyDictionary()
+_http_clients = weakref.WeakKeyDictionary()
+# provider -> in-flight cap of async calls, per event loop
+_semaphores = weakref.WeakKeyDictionary()
+_registry_lock = threading.RLock()
+
+
+def _loop_registry(registry: weakref.WeakKeyDictionary) -> dict:
+    """Get the running event loop's entries of a registry."""
+    return registry.setdefault(asyncio.get_running_loop(), {})
+
+
+def get_provider_semaphore(provider: str) -> asyncio.Semaphore:
+    """Get the semaphore capping a provider's in-flight requests on the running event loop."""
+    with _registry_lock:
+        semaphores = _loop_registry(_semaphores)
+        if provider not in semaphores:
+            semaphores[provider] = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        return semaphores[provider]
+
+
+def get_http_client(provider: Provider) -> httpx.AsyncClient:
+    """Get the pooled keep-alive async HTTP client shared by the models of a provider on the running event loop."""
+    with _registry_lock:
+        clients = _loop_registry(_http_clients)
+        if provider not in clients:
+            clients[provider] = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_CONNECTIONS)
+            )
+        return clients[provider]
+
+
+async def aclose_http_clients():
+    """Close the LLM HTTP clients of the running event loop, before the loop ends."""
+    with _registry_lock:
+        clients = list(_loop_registry(_http_clients).values())
+        _http_clients.pop(asyncio.get_running_loop(), None)
+    for client in clients:
+        await client.aclose()
 
 
 def get_model(config: LLMConfig):
@@ -30,7 +90,12 @@ def get_model(config: LLMConfig):
         "model": config.model,
         **({"api_key": api_key} if model_config.requires_api_key else {}),
         **({"base_url": model_config.base_url} if model_config.base_url else {}),
-        **({"temperature": config.temperature} if config.temperature is not None else {})
+        **({"temperature": config.temperature} if config.temperature is not None else {}),
+        # OpenAI-compatible clients take the provider's shared transport; ChatAnthropic pools through
+        # langchain-anthropic's own process-wide client and ChatOllama within the cached instance
+        **({"http_async_client": get_http_client(provider)} if "http_async_client" in model_config.model_class.model_fields else {}),
+        # aagent_call owns the retry policy, see llm/retry.py
+        **({"max_retries": 0} if "max_retries" in model_config.model_class.model_fields else {})
     }
     
     try:
@@ -39,9 +104,89 @@ def get_model(config: LLMConfig):
         logger.error(f"{provider} Chat Error: {e}")
         raise ValueError(f"{provider} Chat Error: {e}")
 
-def agent_call(prompt: str, llm_config: Dict[str, Any], pydantic_model: BaseModel):
+def get_cached_model(config: LLMConfig) -> BaseChatModel:
+    """Get the model instance for (provider, model, temperature) on the running event loop, built on first use."""
+    key = (config.provider, config.model, config.temperature)
+    with _registry_lock:
+        models = _loop_registry(_models)
+        if key not in models:
+            models[key] = get_model(config)
+        return models[key]
+
+
+def get_structured_model(config: LLMConfig, pydantic_model: type[BaseModel]) -> Runnable:
+    """Get the cached structured-output runnable of a model for a pydantic output model."""
+    key = (config.provider, config.model, config.temperature, pydantic_model)
+    with _registry_lock:
+        structured_models = _loop_registry(_structured_models)
+        if key not in structured_models:
+            # Explicitly use function_calling method for structured output,
+            # keeping the raw message for its token usage
+            structured_models[key] = get_cached_model(config).with_structured_output(
+                pydantic_model, method="function_calling", include_raw=True
+            )
+        return structured_models[key]
+
+
+def release_models():
+    """Drop the cached models of every event loop."""
+    with _registry_lock:
+        _structured_models.clear()
+        _models.clear()
+
+
+def count_tokens(message) -> int:
+    """Total tokens a response message reports, 0 if the provider doesn't report usage."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    return usage.get("total_tokens", 0)
+
+
+def _cache_lookup(llm_cfg: LLMConfig, prompt: str, pydantic_model: type[BaseModel]):
+    """Get the cache and key of a call, if the experiment opted in, and the cached output if any."""
+    if not llm_cfg.cache:
+        return None, None, None
+    cache = get_llm_cache()
+    key = cache.make_key(llm_cfg.cache_namespace, llm_cfg.provider, llm_cfg.model,
+                         llm_cfg.temperature, pydantic_model, prompt)
+    return cache, key, cache.get(key, pydantic_model)
+
+
+def _parse_response(response: dict, llm_cfg: LLMConfig, cache, key: str):
+    """Get the parsed output of a structured response, caching it if enabled."""
+    result = response["parsed"]
+    if result is None:
+        raise ParseError(f"LLM returned no parsable output: {response['parsing_error']}")
+    if cache:
+        cache.set(key, llm_cfg.cache_namespace, llm_cfg.model, result, count_tokens(response["raw"]), llm_cfg.cache_ttl)
+    return result
+
+
+def _on_error(error: Exception, attempt: int, llm_cfg: LLMConfig, record: CallRecord):
+    """Classify and record a failed attempt; get its kind and the wait before retrying, None to give up."""
+    kind = classify_error(error)
+    if kind in FATAL_KINDS or attempt == llm_cfg.max_retries - 1:
+        record.error(kind)
+        logger.warning(f"Attempt {attempt + 1}/{llm_cfg.max_retries} failed ({kind}), not retrying: {error}")
+        return kind, None
+    wait = backoff(kind, attempt, error)
+    record.error(kind, wait)
+    logger.warning(f"Attempt {attempt + 1}/{llm_cfg.max_retries} failed ({kind}), retrying in {wait:.1f}s: {error}")
+    return kind, wait
+
+
+def _on_done(record: CallRecord):
+    """Record a finished call in the process-wide retry stats."""
+    if record.failed:
+        logger.error(f"LLM call failed after {record.summary()}, falling back to defaults")
+    elif record.retries:
+        logger.info(f"LLM call succeeded after {record.summary()}")
+    get_retry_stats().record(record)
+
+
+async def aagent_call(prompt: str, llm_config: Dict[str, Any], pydantic_model: BaseModel):
     """
-    Makes an agent call with retry logic and structured output.
+    Makes an agent call with retry logic and structured output, bounded by the provider's
+    in-flight cap on the running loop.
     
     Args:
         prompt: The prompt to send to the LLM
@@ -51,21 +196,30 @@ def agent_call(prompt: str, llm_config: Dict[str, Any], pydantic_model: BaseMode
         An instance of output_model (with defaults if error occurs)
     """
     llm_cfg = LLMConfig(**llm_config)
-    llm = get_model(llm_cfg)
-
-    # Explicitly use function_calling method for structured output
-    llm = llm.with_structured_output(pydantic_model, method="function_calling")
-
-    for attempt in range(llm_cfg.max_retries):
-        try:
-            result = llm.invoke(prompt)
-            if result is None:
-                raise ValueError("LLM returned None")
-            return result
-        except Exception as e:
-            logger.warning(f"Attempt {attempt + 1}/{llm_cfg.max_retries} failed: {e}")
-            if attempt == llm_cfg.max_retries - 1:
-                logger.error(f"All {llm_cfg.max_retries} attempts failed")
-                return pydantic_model()
-    
-    return pydantic_model() 
\ No newline at end of file
+    llm = get_structured_model(llm_cfg, pydantic_model)
+
+    cache, key, result = _cache_lookup(llm_cfg, prompt, pydantic_model)
+    if result is not None:
+        return result
+
+    semaphore = get_provider_semaphore(llm_cfg.provider)
+    record = CallRecord()
+    request = prompt
+    try:
+        for attempt in range(llm_cfg.max_retries):
+            try:
+                async with semaphore:
+                    response = await llm.ainvoke(request)
+                return _parse_response(response, llm_cfg, cache, key)
+            except Exception as e:
+                kind, wait = _on_error(e, attempt, llm_cfg, record)
+                if wait is None:
+                    break
+                if kind == ErrorKind.PARSE:
+                    request = reprompt(prompt, e)
+                # back off outside the semaphore so other calls can proceed
+                await asyncio.sleep(wait)
+        record.failed = True
+        return pydantic_model()
+    finally:
+        _on_done(record)
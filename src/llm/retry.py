@@ -0,0 +1,189 @@
+"""
+Retry policy of aagent_call.
+Errors are classified; throttling, timeouts and server errors back off exponentially with
+full jitter (honouring Retry-After), schema-parse failures are re-prompted right away,
+and auth or bad-request errors are not retried. Retries and wait time are recorded per call.
+"""
+
+import os
+import random
+import asyncio
+import threading
+from enum import Enum
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import httpx
+from pydantic import ValidationError
+
+
+def _env_float(key: str, default: float) -> float:
+    value = os.environ.get(key)
+    return float(value) if value else default
+
+BACKOFF_BASE = _env_float("LLM_BACKOFF_BASE", 1.0)
+BACKOFF_MAX = _env_float("LLM_BACKOFF_MAX", 60.0)
+
+
+class ErrorKind(str, Enum):
+    """Kind of a failed LLM call"""
+    RATE_LIMIT = "rate_limit"
+    TIMEOUT = "timeout"
+    SERVER = "server"
+    CONNECTION = "connection"
+    PARSE = "parse"
+    AUTH = "auth"
+    BAD_REQUEST = "bad_request"
+    UNKNOWN = "unknown"
+
+    def __str__(self) -> str:
+        return self.value
+
+# kinds that can't succeed on a retry
+FATAL_KINDS = {ErrorKind.AUTH, ErrorKind.BAD_REQUEST}
+
+
+class ParseError(ValueError):
+    """The LLM answered, but not with output matching the schema."""
+
+
+def _status_code(error: Exception):
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def classify_error(error: Exception) -> ErrorKind:
+    """Classify an LLM call error by its HTTP status, or by its type for SDK-agnostic cases."""
+    if isinstance(error, (ParseError, ValidationError)):
+        return ErrorKind.PARSE
+
+    status = _status_code(error)
+    if status == 429:
+        return ErrorKind.RATE_LIMIT
+    if status in (401, 403):
+        return ErrorKind.AUTH
+    if status == 408:
+        return ErrorKind.TIMEOUT
+    if status is not None and status >= 500:
+        return ErrorKind.SERVER
+    if status is not None and 400 <= status < 500:
+        return ErrorKind.BAD_REQUEST
+
+    # provider SDKs wrap httpx errors in their own types, named alike across SDKs
+    names = {cls.__name__ for cls in type(error).__mro__}
+    if isinstance(error, (httpx.TimeoutException, asyncio.TimeoutError, TimeoutError)) or "APITimeoutError" in names:
+        return ErrorKind.TIMEOUT
+    if isinstance(error, (httpx.TransportError, ConnectionError)) or "APIConnectionError" in names:
+        return ErrorKind.CONNECTION
+    if "RateLimitError" in names:
+        return ErrorKind.RATE_LIMIT
+    if "AuthenticationError" in names or "PermissionDeniedError" in names:
+        return ErrorKind.AUTH
+    if "OutputParserException" in names:
+        return ErrorKind.PARSE
+    return ErrorKind.UNKNOWN
+
+
+def retry_after(error: Exception):
+    """Seconds the provider asked to wait via Retry-After (seconds or HTTP date), None if not sent."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff(kind: ErrorKind, attempt: int, error: Exception) -> float:
+    """Seconds to wait before the next attempt: none to re-prompt, else Retry-After or full jitter."""
+    if kind == ErrorKind.PARSE:
+        return 0.0
+    wait = retry_after(error)
+    if wait is not None:
+        return min(wait, BACKOFF_MAX)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def reprompt(prompt: str, error: Exception) -> str:
+    """The prompt with the parse error fed back, for the model to correct its output."""
+    return (
+        f"{prompt}\n\n"
+        f"Your previous answer could not be parsed into the required output schema ({error}). "
+        f"Answer again with arguments that match the schema exactly."
+    )
+
+
+class CallRecord:
+    """Retries of one aagent_call."""
+
+    def __init__(self):
+        self.retries = 0
+        self.wait_seconds = 0.0
+        self.errors: list[ErrorKind] = []
+        self.failed = False
+
+    def error(self, kind: ErrorKind, wait: float = None):
+        """Record a failed attempt, and the wait before retrying it if it is retried."""
+        self.errors.append(kind)
+        if wait is not None:
+            self.retries += 1
+            self.wait_seconds += wait
+
+    def summary(self) -> str:
+        return f"{self.retries} retries, {self.wait_seconds:.1f}s waited, errors: {[str(k) for k in self.errors]}"
+
+
+class RetryStats:
+    """Process-wide retry counters of aagent_call."""
+
+    def __init__(self):
+        self.calls = 0
+        self.retried_calls = 0
+        self.failed_calls = 0
+        self.retries = 0
+        self.wait_seconds = 0.0
+        self.errors: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call: CallRecord):
+        with self._lock:
+            self.calls += 1
+            self.retried_calls += 1 if call.retries else 0
+            self.failed_calls += 1 if call.failed else 0
+            self.retries += call.retries
+            self.wait_seconds += call.wait_seconds
+            for kind in call.errors:
+                self.errors[str(kind)] = self.errors.get(str(kind), 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retried_calls": self.retried_calls,
+                "failed_calls": self.failed_calls,
+                "retries": self.retries,
+                "wait_seconds": round(self.wait_seconds, 2),
+                "errors": dict(self.errors),
+            }
+
+
+_retry_stats = RetryStats()
+
+def get_retry_stats() -> RetryStats:
+    """Get the process-wide aagent_call retry counters."""
+    return _retry_stats
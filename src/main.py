@@ -5,6 +5,8 @@ from graph.workflow import AgentWorkflow
 from util.config import ConfigParser
 from util.logger import logger
 from util.db_helper import db_initialize, get_db
+from apis.replay import replay_initialize, replay_release
+from llm.inference import release_models
 
 # Load environment variables from .env file
 load_dotenv()
@@ -27,12 +29,15 @@ def main():
     parser.add_argument("--config", type=str, required=True, help="Path to configuration file")
     parser.add_argument("--trading-date", type=str, required=True, help="Trading date in format YYYY-MM-DD")
     parser.add_argument("--local-db", action="store_true", help="Use local SQLite database")
+    parser.add_argument("--record", type=str, metavar="DIR", help="Record API responses to an archive directory")
+    parser.add_argument("--replay", type=str, metavar="DIR", help="Serve API responses from a recorded archive, no network")
     args = parser.parse_args()
 
     cfg = ConfigParser(args).get_config()
 
     # Initialize the global database connection based on the local-db flag
     db_initialize(use_local_db=args.local_db)
+    replay_initialize(record_dir=args.record, replay_dir=args.replay)
     db = get_db()
     logger.info(f"Loading config for {cfg['exp_name']}, trading date: {args.trading_date}")
     config_id = load_portfolio_config(cfg, db)
@@ -50,6 +55,9 @@ def main():
     except Exception as e:
         logger.error(f"Error during portfolio operations: {e}")
         raise
+    finally:
+        replay_release()
+        release_models()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,360 @@
+"""
+Streaming technical indicators.
+IndicatorEngine keeps the compact state the technical signals need (EMA values and short
+ring buffers of closes, volumes, returns and volatilities) and folds in one candle at a time,
+so a day-over-day run only processes the bars added since the previous one. State is
+persisted per ticker under MARKET_DATA_DIR/indicators.
+"""
+
+import os
+import json
+import math
+import pickle
+import hashlib
+import threading
+from collections import deque
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# historical volatility window and the regime window over it, in bars
+VOL_WINDOW = 21
+VOL_REGIME_WINDOW = 63
+ANNUALIZATION = math.sqrt(252)
+
+
+def _mean(values) -> float:
+    return float(np.mean(values))
+
+def _std(values) -> float:
+    """Sample standard deviation, like pandas rolling std."""
+    return float(np.std(values, ddof=1))
+
+
+class IndicatorEngine:
+    """Indicator state for one ticker under one set of technical thresholds."""
+
+    def __init__(self, params: dict):
+        self.params = params
+        self.params_key = self.make_params_key(params)
+        self.count = 0
+        self.first_date = None
+        self.last_date = None
+
+        trend = params["trend"]
+        self.spans = sorted({trend["short"], trend["medium"], trend["long"]})
+        self.emas = {span: None for span in self.spans}
+
+        mean_reversion, rsi, volume = params["mean_reversion"], params["rsi"], params["volume"]
+        close_len = max(mean_reversion["bollinger_window"], mean_reversion["rolling_window"],
+                        rsi["period"] + 1, volume["correlation"])
+        volume_len = max(volume["trend"] + 1, volume["correlation"])
+        self.closes = deque(maxlen=close_len)
+        self.volumes = deque(maxlen=volume_len)
+        self.returns = deque(maxlen=VOL_WINDOW)
+        self.hist_vols = deque(maxlen=VOL_REGIME_WINDOW)
+
+    @staticmethod
+    def make_params_key(params: dict) -> str:
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+    def update(self, date, close: float, volume: float):
+        """Fold in the next candle."""
+        prev_close = self.closes[-1] if self.closes else None
+
+        for span in self.spans:
+            ema = self.emas[span]
+            alpha = 2 / (span + 1)
+            self.emas[span] = close if ema is None else alpha * close + (1 - alpha) * ema
+
+        self.returns.append(close / prev_close - 1 if prev_close is not None else math.nan)
+        self.hist_vols.append(
+            _std(self.returns) * ANNUALIZATION if len(self.returns) == VOL_WINDOW else math.nan
+        )
+
+        self.closes.append(close)
+        self.volumes.append(volume)
+        self.count += 1
+        if self.first_date is None:
+            self.first_date = date
+        self.last_date = date
+
+    # readers, all as of the last candle; NaN while the window isn't full yet
+
+    def close(self) -> float:
+        return self.closes[-1]
+
+    def volume(self) -> float:
+        return self.volumes[-1]
+
+    def ema(self, span: int) -> float:
+        return self.emas[span]
+
+    def rolling_mean_std(self, window: int) -> tuple[float, float]:
+        if self.count < window:
+            return math.nan, math.nan
+        values = list(self.closes)[-window:]
+        return _mean(values), _std(values)
+
+    def rsi(self, period: int) -> float:
+        """Simple-average RSI; the first bar has no change and counts as a zero move."""
+        if self.count < period:
+            return math.nan
+        deltas = np.diff(list(self.closes)[-(period + 1):])
+        deltas = np.concatenate([np.zeros(period - len(deltas)), deltas])
+        avg_gain = deltas[deltas > 0].sum() / period
+        avg_loss = -deltas[deltas < 0].sum() / period
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = np.float64(avg_gain) / avg_loss
+            return float(100 - (100 / (1 + rs)))
+
+    def volatility_regime(self) -> tuple[float, float]:
+        """Current historical volatility over its regime average, and its z-score."""
+        hist_vol = self.hist_vols[-1]
+        if len(self.hist_vols) < VOL_REGIME_WINDOW:
+            return math.nan, math.nan
+        vol_ma, vol_std = _mean(self.hist_vols), _std(self.hist_vols)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return float(np.float64(hist_vol) / vol_ma), float(np.float64(hist_vol - vol_ma) / vol_std)
+
+    def volume_mean(self, window: int, lag: int = 0) -> float:
+        """Mean volume over `window` bars ending `lag` bars ago."""
+        if self.count < window + lag:
+            return math.nan
+        values = list(self.volumes)
+        return _mean(values[len(values) - lag - window:len(values) - lag])
+
+    def price_volume_corr(self, window: int) -> float:
+        if self.count < window:
+            return math.nan
+        closes = np.array(list(self.closes)[-window:])
+        volumes = np.array(list(self.volumes)[-window:], dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = np.cov(closes, volumes, ddof=1)
+            return float(cov[0, 1] / math.sqrt(cov[0, 0] * cov[1, 1])) if cov[0, 0] * cov[1, 1] > 0 else math.nan
+
+    def to_dict(self) -> dict:
+        return {
+            "params_key": self.params_key,
+            "count": self.count,
+            "first_date": self.first_date,
+            "last_date": self.last_date,
+            "emas": {str(span): value for span, value in self.emas.items()},
+            "closes": list(self.closes),
+            "volumes": list(self.volumes),
+            "returns": list(self.returns),
+            "hist_vols": list(self.hist_vols),
+        }
+
+    @classmethod
+    def from_dict(cls, params: dict, state: dict) -> "IndicatorEngine":
+        engine = cls(params)
+        engine.params_key = state["params_key"]
+        engine.count = state["count"]
+        engine.first_date = state["first_date"]
+        engine.last_date = state["last_date"]
+        engine.emas = {int(span): value for span, value in state["emas"].items()}
+        engine.closes.extend(state["closes"])
+        engine.volumes.extend(state["volumes"])
+        engine.returns.extend(state["returns"])
+        engine.hist_vols.extend(state["hist_vols"])
+        return engine
+
+
+class IndicatorStore:
+    """Per-ticker engine state as small pickles under `root`, with the latest engines kept in memory."""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._engines: dict[str, IndicatorEngine] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def lock(self, ticker: str) -> threading.Lock:
+        """Per-ticker lock so concurrent runs of one ticker don't race."""
+        with self._locks_lock:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{ticker}.pkl")
+
+    def load(self, ticker: str, params: dict):
+        """Load the ticker's engine, None if missing or built with other thresholds."""
+        engine = self._engines.get(ticker)
+        if engine is None:
+            try:
+                with open(self._path(ticker), "rb") as f:
+                    engine = IndicatorEngine.from_dict(params, pickle.load(f))
+            except (FileNotFoundError, pickle.UnpicklingError, EOFError, KeyError):
+                return None
+        if engine.params_key != IndicatorEngine.make_params_key(params):
+            return None
+        return engine
+
+    def save(self, ticker: str, engine: IndicatorEngine):
+        """Persist the engine, written to a temp file and swapped in."""
+        path = self._path(ticker)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(engine.to_dict(), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self._engines[ticker] = engine
+
+
+def get_indicators(ticker: str, prices_df: pd.DataFrame, params: dict) -> IndicatorEngine:
+    """
+    Get the ticker's indicators as of the last bar of prices_df (indexed by date).
+    The stored engine is advanced over the bars after its last date; it is rebuilt from
+    the first bar when prices_df doesn't extend it (earlier date, other history or thresholds).
+    """
+    store = get_indicator_store()
+    index = prices_df.index
+
+    with store.lock(ticker):
+        engine = store.load(ticker, params)
+        start = 0
+        if engine is not None and len(index) and engine.first_date == f"{index[0]:%Y-%m-%d}":
+            # the index is sorted, find where the engine left off
+            start = int(index.searchsorted(pd.Timestamp(engine.last_date), side="right"))
+            if start == 0 or f"{index[start - 1]:%Y-%m-%d}" != engine.last_date:
+                engine = None
+        else:
+            engine = None
+        if engine is None:
+            engine, start = IndicatorEngine(params), 0
+
+        new_bars = prices_df.iloc[start:]
+        dates = new_bars.index.strftime("%Y-%m-%d")
+        closes = new_bars["close"].to_numpy(dtype=float).tolist()
+        volumes = new_bars["volume"].to_numpy(dtype=float).tolist()
+        for date, close, volume in zip(dates, closes, volumes):
+            engine.update(date, close, volume)
+        if len(new_bars):
+            store.save(ticker, engine)
+    return engine
+
+
+class IndicatorSnapshot:
+    """Indicator values of one ticker as of its last bar, with the IndicatorEngine readers."""
+
+    def __init__(self, values: dict):
+        self.values = values
+
+    def close(self) -> float:
+        return self.values["close"]
+
+    def volume(self) -> float:
+        return self.values["volume"]
+
+    def ema(self, span: int) -> float:
+        return self.values[("ema", span)]
+
+    def rolling_mean_std(self, window: int) -> tuple[float, float]:
+        return self.values[("rolling_mean_std", window)]
+
+    def rsi(self, period: int) -> float:
+        return self.values[("rsi", period)]
+
+    def volatility_regime(self) -> tuple[float, float]:
+        return self.values["volatility_regime"]
+
+    def volume_mean(self, window: int, lag: int = 0) -> float:
+        return self.values[("volume_mean", window, lag)]
+
+    def price_volume_corr(self, window: int) -> float:
+        return self.values[("price_volume_corr", window)]
+
+
+class PanelIndicators:
+    """
+    Indicators for many tickers in one pass over a bars x tickers panel.
+    Each ticker's history is right-aligned on its own last bar and NaN-padded in front,
+    so every window covers the same bars it would for that ticker alone.
+    """
+
+    def __init__(self, prices: dict[str, pd.DataFrame], params: dict):
+        self.tickers = list(prices)
+        self._columns = {ticker: j for j, ticker in enumerate(self.tickers)}
+        trend, mean_reversion = params["trend"], params["mean_reversion"]
+        rsi_period, volume = params["rsi"]["period"], params["volume"]
+        spans = sorted({trend["short"], trend["medium"], trend["long"]})
+        windows = sorted({mean_reversion["bollinger_window"], mean_reversion["rolling_window"]})
+
+        # pad to at least the longest lookback so the tail slices below are full height
+        lookback = max(windows + [rsi_period + 1, volume["trend"] + 1, volume["correlation"], VOL_WINDOW + VOL_REGIME_WINDOW])
+        num_bars = max([len(df) for df in prices.values()] + [lookback])
+        closes = np.full((num_bars, len(self.tickers)), np.nan)
+        volumes = np.full((num_bars, len(self.tickers)), np.nan)
+        for j, df in enumerate(prices.values()):
+            closes[num_bars - len(df):, j] = df["close"].to_numpy(dtype=float)
+            volumes[num_bars - len(df):, j] = df["volume"].to_numpy(dtype=float)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = {
+                "close": closes[-1],
+                "volume": volumes[-1],
+                "volatility_regime": self._volatility_regime(closes),
+            }
+            # EMAs need the whole history, the recursion runs column-wise in pandas
+            ema_input = pd.DataFrame(closes)
+            for span in spans:
+                values[("ema", span)] = ema_input.ewm(span=span, adjust=False).mean().to_numpy()[-1]
+            for window in windows:
+                tail = closes[-window:]
+                values[("rolling_mean_std", window)] = (tail.mean(axis=0), tail.std(axis=0, ddof=1))
+            values[("rsi", rsi_period)] = self._rsi(closes, rsi_period)
+            values[("volume_mean", volume["trend"], 0)] = volumes[-volume["trend"]:].mean(axis=0)
+            values[("volume_mean", volume["trend"], 1)] = volumes[-volume["trend"] - 1:-1].mean(axis=0)
+            values[("price_volume_corr", volume["correlation"])] = self._corr(
+                closes[-volume["correlation"]:], volumes[-volume["correlation"]:]
+            )
+        self.values = values
+
+    @staticmethod
+    def _rsi(closes: np.ndarray, period: int) -> np.ndarray:
+        deltas = np.diff(closes[-(period + 1):], axis=0)
+        # a ticker's first bar has no change and counts as a zero move
+        deltas = np.where(np.isnan(deltas) & ~np.isnan(closes[-period:]), 0.0, deltas)
+        avg_gain = np.where(deltas > 0, deltas, np.where(np.isnan(deltas), np.nan, 0.0)).sum(axis=0) / period
+        avg_loss = np.where(deltas < 0, -deltas, np.where(np.isnan(deltas), np.nan, 0.0)).sum(axis=0) / period
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    @staticmethod
+    def _volatility_regime(closes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        tail = closes[-(VOL_WINDOW + VOL_REGIME_WINDOW):]
+        returns = tail[1:] / tail[:-1] - 1
+        hist_vols = np.std(sliding_window_view(returns, VOL_WINDOW, axis=0), axis=-1, ddof=1) * ANNUALIZATION
+        hist_vols = hist_vols[-VOL_REGIME_WINDOW:]
+        vol_ma, vol_std = hist_vols.mean(axis=0), hist_vols.std(axis=0, ddof=1)
+        return hist_vols[-1] / vol_ma, (hist_vols[-1] - vol_ma) / vol_std
+
+    @staticmethod
+    def _corr(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        dx, dy = x - x.mean(axis=0), y - y.mean(axis=0)
+        var = (dx * dx).sum(axis=0) * (dy * dy).sum(axis=0)
+        return np.where(var > 0, (dx * dy).sum(axis=0) / np.sqrt(var), np.nan)
+
+    def for_ticker(self, ticker: str) -> IndicatorSnapshot:
+        j = self._columns[ticker]
+        snapshot = {}
+        for key, value in self.values.items():
+            if isinstance(value, tuple):
+                snapshot[key] = tuple(float(v[j]) for v in value)
+            else:
+                snapshot[key] = float(value[j])
+        return IndicatorSnapshot(snapshot)
+
+
+# process-wide store
+_store = None
+_store_lock = threading.Lock()
+
+def get_indicator_store() -> IndicatorStore:
+    """Get the process-wide indicator store under MARKET_DATA_DIR."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            root = os.environ.get("MARKET_DATA_DIR", "assets/market_data")
+            _store = IndicatorStore(os.path.join(root, "indicators"))
+        return _store
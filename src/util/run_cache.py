@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+from util.logger import logger
+
+
+class RunCache:
+    """
+    Run-scoped memo for data shared across tickers and agents.
+    Concurrent callers asking for the same key wait for a single fetch.
+    """
+
+    def __init__(self):
+        self._values: dict = {}
+        self._key_locks: dict = {}
+        self._inflight: dict = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key_lock(self, key: Hashable) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """Get the value for key, calling fetch once on a miss. Errors are not cached."""
+        with self._key_lock(key):
+            if key in self._values:
+                with self._lock:
+                    self.hits += 1
+                return self._values[key]
+            with self._lock:
+                self.misses += 1
+            value = fetch()
+            self._values[key] = value
+            return value
+
+    async def aget_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Async counterpart of get_or_fetch, concurrent coroutines share one in-flight fetch."""
+        if key in self._values:
+            with self._lock:
+                self.hits += 1
+            return self._values[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            with self._lock:
+                self.misses += 1
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            try:
+                value = await task
+                self.set(key, value)
+                return value
+            finally:
+                self._inflight.pop(key, None)
+        return await task
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value without fetching."""
+        return self._values.get(key, default)
+
+    def set(self, key: Hashable, value: Any):
+        """Seed a value, e.g. from a bulk fetch."""
+        with self._key_lock(key):
+            self._values[key] = value
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._values
+
+    def stats(self) -> dict:
+        """Get hit/miss counters."""
+        return {"entries": len(self._values), "hits": self.hits, "misses": self.misses}
+
+
+# global variable owned by AgentWorkflow.run
+run_cache = None
+
+def run_cache_initialize():
+    """Start a fresh run cache."""
+    global run_cache
+    run_cache = RunCache()
+    logger.info("Run cache initialized")
+
+def run_cache_release():
+    """Drop the run cache at the end of a run."""
+    global run_cache
+    if run_cache:
+        logger.info(f"Run cache released: {run_cache.stats()}")
+    run_cache = None
+
+def get_run_cache():
+    """Get the run cache, None outside of a run."""
+    return run_cache